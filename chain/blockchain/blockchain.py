@@ -63,7 +63,9 @@ class Blockchain(object):
             is_valid = False
             errors = None
             for _ in range(5):
-                is_valid, errors = self.database.verify_blockchain()
+                is_valid, errors = self.database.verify_blockchain(
+                    deep=config.database["deep_integrity_check"]
+                )
                 if is_valid:
                     break
                 else:
@@ -159,23 +161,26 @@ class Blockchain(object):
                     sum([x.number_of_transactions for x in blocks]),
                 )
 
-                for block in blocks:
-                    status = self.process_block(block, last_block)
-                    logger.info("Block %s was %s", block.id, status)
-                    if status == BLOCK_ACCEPTED:
-                        last_block = block
-                    else:
-
-                        raise Exception("Block not accepted")
-
-                        # TODO: Think about banning the peer at this point as it's most
-                        # likely that it's a bad peer
-                        logger.info(block.serialize())
-                        logger.info(
-                            "Block %s was %s. Skipping all other blocks in this batch",
-                            block.id,
-                            status,
-                        )
+                with self.database.batch(config.database["sync_batch_size"]):
+                    for block in blocks:
+                        status = self.process_block(block, last_block)
+                        logger.info("Block %s was %s", block.id, status)
+                        if status == BLOCK_ACCEPTED:
+                            last_block = block
+                        else:
+                            # Keep the blocks that were accepted before this one
+                            self.database.checkpoint()
+                            raise Exception("Block not accepted")
+
+                            # TODO: Think about banning the peer at this point as it's
+                            # most likely that it's a bad peer
+                            logger.info(block.serialize())
+                            logger.info(
+                                "Block %s was %s. Skipping all other blocks in this "
+                                "batch",
+                                block.id,
+                                status,
+                            )
             else:
                 # TODO: Think about banning the peer at this point as it's most
                 # likely that it's a bad peer
@@ -285,31 +290,27 @@ class Blockchain(object):
         return BLOCK_ACCEPTED
 
     def _validate_generator(self, block):
-        delegates = self.database.get_active_delegates(block.height)
-        if not delegates:
+        schedule = self.database.get_active_delegates(block.height)
+        if not schedule:
             logger.error("Could not find delegates for block height %s", block.height)
             return False
         slot_number = slots.get_slot_number(block.height, block.timestamp)
         generator_username = self.database.wallets.find_by_public_key(
             block.generator_public_key
         ).username
-        forging_delegate = None
 
-        forging_delegate = delegates[slot_number % len(delegates)]
+        forging_delegate = schedule.get_delegate_for_slot(slot_number)
 
-        if (
-            forging_delegate
-            and forging_delegate.public_key != block.generator_public_key
-        ):
+        if forging_delegate and forging_delegate != block.generator_public_key:
             forging_username = self.database.wallets.find_by_public_key(
-                forging_delegate.public_key
+                forging_delegate
             ).username
             logger.error(
                 "Delegate %s (%s) not allowed to forge, should be %s (%s)",
                 generator_username,
                 block.generator_public_key,
                 forging_username,
-                forging_delegate.public_key,
+                forging_delegate,
             )
             return False
         # TODO: this seems weird as we can't decide if delegate is allowed to forge, but
@@ -367,15 +368,8 @@ class Blockchain(object):
                 logger.warning(
                     "Detect double forging by %s", block.generator_public_key
                 )
-                delegates = self.database.get_active_delegates(block.height)
-
-                is_active_delegate = False
-                for delegate in delegates:
-                    if delegate.public_key == block.generator_public_key:
-                        is_active_delegate = True
-                        break
-
-                if is_active_delegate:
+                schedule = self.database.get_active_delegates(block.height)
+                if block.generator_public_key in schedule:
                     self.recover_from_fork()
                 return BLOCK_REJECTED
 
@@ -412,7 +406,7 @@ class Blockchain(object):
         if is_block_exception(block):
             return self._handle_exception_block(block)
 
-        is_verified, errors = block.verify()
+        is_verified, errors = block.verify(early_exit=True)
         if not is_verified:
             logger.error(errors)
             return self._hande_verification_failed(block)
@@ -437,7 +431,7 @@ class Blockchain(object):
             serialized_block = self.process_queue.pop_block()
             if serialized_block:
                 last_block = self.database.get_last_block()
-                block = Block.from_serialized(serialized_block)
+                block = Block.from_bytes(serialized_block)
                 status = self.process_block(block, last_block)
                 logger.info(status)
                 if status in [BLOCK_ACCEPTED, BLOCK_DISCARDED_BUT_CAN_BE_BROADCASTED]:
@@ -1,5 +1,7 @@
 import json
+import math
 import os
+from bisect import bisect_right
 from hashlib import sha256
 from operator import itemgetter
 
@@ -15,6 +17,33 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 
+class ExceptionIndex(object):
+    """Exceptions from `exceptions.json` compiled into sets and dictionaries, so
+    that checking if a block or a transaction is an exception takes constant time
+    """
+
+    __slots__ = ("blocks", "transactions", "transaction_id_fix_table")
+
+    def __init__(self, exceptions):
+        self.blocks = frozenset(exceptions.get("blocks", []))
+        self.transactions = frozenset(exceptions.get("transaction", []))
+        self.transaction_id_fix_table = dict(
+            exceptions.get("transactionIdFixTable", {})
+        )
+
+    def is_block_exception(self, block_id):
+        return block_id in self.blocks
+
+    def is_transaction_exception(self, transaction_id):
+        return transaction_id in self.transactions
+
+    def fix_transaction_id(self, transaction_id):
+        """Returns fixed transaction id if the calculated one is defined in
+        transaction id fix table, otherwise returns the same id
+        """
+        return self.transaction_id_fix_table.get(transaction_id, transaction_id)
+
+
 class Config(dict, metaclass=SingletonMeta):
     """Object that holds all the configuration for the chain
     """
@@ -34,6 +63,7 @@ class Config(dict, metaclass=SingletonMeta):
 
         with open(os.path.join(folder, "exceptions.json")) as f:
             self.exceptions = json.loads(f.read())
+        self.exception_index = ExceptionIndex(self.exceptions)
 
         with open(os.path.join(folder, "peers.json")) as f:
             self.peers = json.loads(f.read())
@@ -65,6 +95,58 @@ class Config(dict, metaclass=SingletonMeta):
             },
         }
 
+        # TODO: put this in config file
+        self.crypto = {
+            # Process pool used for signature verification and deserialization
+            "process_pool": {
+                "max_workers": None  # defaults to the number of processors
+            },
+            # Transaction signatures of a block are verified in a process pool, but
+            # only if block has at least `min_transactions` transactions, otherwise
+            # overhead of sending data to other processes is bigger than the gain
+            "parallel_verification": {
+                "enabled": True,
+                "min_transactions": 100,
+                "chunk_size": 50,
+            },
+            # Same as above, but for deserializing many transactions at once (eg.
+            # when loading blocks with transactions from the database)
+            "parallel_deserialization": {
+                "enabled": True,
+                "min_transactions": 1000,
+                "chunk_size": 250,
+            },
+            # Number of parsed public keys kept in memory for signature verification
+            "public_key_cache_size": 8192,
+            # Number of addresses derived from public keys kept in memory
+            "address_cache_size": 65536,
+            # Transactions with verified signatures are remembered in redis for `ttl`
+            # seconds, so transactions that were verified when they entered the
+            # transaction pool aren't verified again when they're included in a block
+            "verified_signature_cache": {"enabled": True, "ttl": 21600},
+        }
+
+        # TODO: put this in config file
+        self.database = {
+            # Rows are inserted with multi-row INSERT statements of at most
+            # `insert_batch_size` rows. When there are at least `copy_threshold` rows
+            # to insert at once, they are loaded with postgres COPY instead
+            "bulk_insert": {"insert_batch_size": 500, "copy_threshold": 1000},
+            # When syncing, blocks are committed to the database (and wallets written
+            # to redis) every `sync_batch_size` blocks and at every round change,
+            # instead of after every block
+            "sync_batch_size": 100,
+            # Number of block headers kept in memory for lookups by id or height
+            "block_header_cache_size": 5000,
+            # Number of round delegate schedules kept in memory (schedules are also
+            # shared between processes through redis)
+            "delegate_schedule_cache_size": 10,
+            # If True, integrity of the database is verified on start by scanning
+            # the whole blocks and transactions tables instead of using the stored
+            # chain statistics
+            "deep_integrity_check": False,
+        }
+
         #     /**
         #  * The list of IPs can access the remote/internal API.
         #  *
@@ -80,16 +162,42 @@ class Config(dict, metaclass=SingletonMeta):
         milestones.sort(key=itemgetter("height"))
         self.milestones = milestones
         self.milestone_hash = self._calculate_milestone_hash(milestones)
+        self._index_milestones()
 
     def _calculate_milestone_hash(self, milestones):
         milestones_json = json.dumps(milestones)
         sha_hash = sha256(milestones_json.encode("utf-8")).hexdigest()
         return sha_hash[:16]
 
+    def _index_milestones(self):
+        """Builds a sorted list of milestone heights used for bisect lookups and
+        resets cached height range of the last found milestone
+        """
+        self._milestone_heights = [milestone["height"] for milestone in self.milestones]
+        # (start height, end height, milestone) of the last found milestone
+        self._last_milestone_range = (0, 0, None)
+
     def get_milestone(self, height):
-        for milestone in reversed(self.milestones):
-            if height >= milestone["height"]:
-                return milestone
+        """Returns milestone that is active at given height or None if there is no
+        active milestone
+
+        Most consecutive calls ask for heights within the same milestone, so height
+        range of the last found milestone is checked before doing a bisect lookup.
+        """
+        start, end, milestone = self._last_milestone_range
+        if start <= height < end:
+            return milestone
+
+        heights = self._milestone_heights
+        index = bisect_right(heights, height) - 1
+        if index < 0:
+            return None
+
+        start = heights[index]
+        end = heights[index + 1] if index + 1 < len(heights) else math.inf
+        milestone = self.milestones[index]
+        self._last_milestone_range = (start, end, milestone)
+        return milestone
 
 
 config = Config()
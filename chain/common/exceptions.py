@@ -4,3 +4,7 @@ class ChainException(Exception):
 
 class PeerNotFoundException(ChainException):
     pass
+
+
+class SnapshotException(ChainException):
+    pass
@@ -1,6 +1,7 @@
 import hashlib
 import re
 from binascii import unhexlify
+from functools import lru_cache
 
 from base58 import b58encode_check
 
@@ -8,24 +9,52 @@ from binary.unsigned_integer import write_bit8
 
 from chain.common.config import config
 
+_PUBLIC_KEY_PATTERN = re.compile("^[0-9A-Fa-f]{66}$")
+
+
+@lru_cache(maxsize=config.crypto["address_cache_size"])
+def _address_from_public_key(public_key, network_version):
+    match = _PUBLIC_KEY_PATTERN.fullmatch(public_key)
+    if not match:
+        raise Exception("Invalid public key")  # TODO: better exception
+
+    ripemd160 = hashlib.new("ripemd160", unhexlify(public_key.encode()))
+    payload = write_bit8(network_version) + ripemd160.digest()
+    return b58encode_check(payload).decode()
+
 
 def address_from_public_key(public_key, network_version=None):
     """Get an address from a public key
 
+    Addresses are memoized per public key and network version.
+
     Args:
         public_key (str):
         network_version (int, optional):
 
     Returns:
-        bytes:
+        str:
     """
-    match = re.fullmatch("^[0-9A-Fa-f]{66}$", public_key)
-    if not match:
-        raise Exception("Invalid public key")  # TODO: better exception
+    if not network_version:
+        network_version = config.network["pubKeyHash"]
+
+    return _address_from_public_key(public_key, network_version)
+
+
+def addresses_from_public_keys(public_keys, network_version=None):
+    """Get addresses for a list of public keys
+
+    Args:
+        public_keys (list): list of public keys (str)
+        network_version (int, optional):
 
+    Returns:
+        list: list of addresses (str) in the same order as public keys
+    """
     if not network_version:
         network_version = config.network["pubKeyHash"]
 
-    ripemd160 = hashlib.new("ripemd160", unhexlify(public_key.encode()))
-    payload = write_bit8(network_version) + ripemd160.digest()
-    return b58encode_check(payload).decode()
+    return [
+        _address_from_public_key(public_key, network_version)
+        for public_key in public_keys
+    ]
@@ -1,36 +1,68 @@
-from binary.unsigned_integer import read_bit32, read_bit64, read_bit8
+from struct import Struct
+
+_UINT8 = Struct("<B")
+_UINT32 = Struct("<I")
+_UINT64 = Struct("<Q")
 
 
 # TODO: Put this into binary package
-class ByteBuffer(bytearray):
-    def read_uint8(self):
-        return read_bit8(self)
+class ByteBuffer(object):
+    """Read-only buffer over a `memoryview` that keeps track of the read position.
+
+    Reading data never copies or shifts the underlying bytes, it only moves the
+    cursor forward, so reading the whole buffer is linear in its size.
+
+    :param data: bytes-like object (`bytes`, `bytearray` or `memoryview`)
+    """
+
+    __slots__ = ("_view", "_offset")
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._offset = 0
 
-    def read_uint32(self):
-        return read_bit32(self)
+    def __len__(self):
+        """Number of bytes that haven't been read yet
+        """
+        return len(self._view) - self._offset
 
-    def read_uint64(self):
-        return read_bit64(self)
+    def read_uint8(self, offset=0):
+        return _UINT8.unpack_from(self._view, self._offset + offset)[0]
+
+    def read_uint32(self, offset=0):
+        return _UINT32.unpack_from(self._view, self._offset + offset)[0]
+
+    def read_uint64(self, offset=0):
+        return _UINT64.unpack_from(self._view, self._offset + offset)[0]
 
     def read_bytes(self, num_bytes, offset=0):
-        return bytes(self[offset : offset + num_bytes])
+        start = self._offset + offset
+        return self._view[start : start + num_bytes].tobytes()
 
     def pop_uint8(self):
-        data = read_bit8(self)
-        del self[:1]
+        data = _UINT8.unpack_from(self._view, self._offset)[0]
+        self._offset += 1
         return data
 
     def pop_uint32(self):
-        data = read_bit32(self)
-        del self[:4]
+        data = _UINT32.unpack_from(self._view, self._offset)[0]
+        self._offset += 4
         return data
 
     def pop_uint64(self):
-        data = read_bit64(self)
-        del self[:8]
+        data = _UINT64.unpack_from(self._view, self._offset)[0]
+        self._offset += 8
+        return data
+
+    def pop_view(self, num_bytes):
+        """Pops `num_bytes` as a `memoryview` without copying the data
+        """
+        data = self._view[self._offset : self._offset + num_bytes]
+        self._offset += len(data)
         return data
 
     def pop_bytes(self, num_bytes):
-        data = self[:num_bytes]
-        del self[:num_bytes]
-        return bytes(data)
+        return self.pop_view(num_bytes).tobytes()
+
+    def skip(self, num_bytes):
+        self._offset = min(self._offset + num_bytes, len(self._view))
@@ -0,0 +1,23 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from chain.common.config import config
+
+_executor = None
+
+
+def get_executor():
+    """Returns process pool shared by CPU heavy crypto operations (eg. signature
+    verification and transaction deserialization)
+    """
+    global _executor
+    if _executor is None:
+        max_workers = config.crypto["process_pool"]["max_workers"]
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -12,6 +12,8 @@ class Field(object):
     :param bool required: Whether the field is required.
     """
 
+    __slots__ = ("attr", "required", "_default", "name", "_getter")
+
     getter_takes_serializer = False
     accepted_types = None
 
@@ -208,6 +210,12 @@ class BaseObjectMeta(type):
         for k in direct_fields.keys():
             del attrs[k]
 
+        # Keep field values in slots instead of instance __dict__, which makes
+        # objects smaller and attribute access faster
+        attrs["__slots__"] = tuple(attrs.get("__slots__", ())) + tuple(
+            direct_fields.keys()
+        )
+
         real_cls = super().__new__(cls, name, bases, attrs)
         compiled_fields = cls._compile_fields(direct_fields, real_cls)
 
@@ -216,20 +224,45 @@ class BaseObjectMeta(type):
         all_fields = compiled_fields + base_classes_fields
         real_cls._fields = all_fields
         real_cls._field_map = {x.name: x for x in all_fields}
+        # Fields that cached values (eg. serialized bytes) are derived from
+        real_cls._cached_fields = frozenset(real_cls._field_map) - frozenset(
+            real_cls._uncached_fields
+        )
         return real_cls
 
 
 class BaseObject(Field, metaclass=BaseObjectMeta):
+    __slots__ = ("_cache",)
+
     _fields = []
+    # Names of fields that are not part of any cached value, so changing them
+    # doesn't clear the cache
+    _uncached_fields = ()
 
-    def __init__(self, data=None, instance=None, **kwargs):
+    def __init__(self, data=None, instance=None, trusted=False, **kwargs):
+        """
+        :param dict data: dictionary with camelCase field names as keys
+        :param object instance: object with attributes named the same as fields
+        :param bool trusted: if True, values from `data` or `instance` are set
+            without validation and conversion. Use only for already validated data
+            (eg. rows from our own database) whose values are of correct types.
+        """
+        # Values derived from fields (eg. serialized bytes, hashes). It's cleared
+        # whenever one of the fields in `_cached_fields` changes its value.
+        self._cache = {}
         super().__init__()
         if data:
             if not isinstance(data, dict):
                 raise TypeError("data must be dict")
-            self._populate_from_dict(data)
+            if trusted:
+                self._populate_trusted_from_dict(data)
+            else:
+                self._populate_from_dict(data)
         elif instance:
-            self._populate_from_instance(instance)
+            if trusted:
+                self._populate_trusted_from_instance(instance)
+            else:
+                self._populate_from_instance(instance)
         else:
             self._populate_with_default_values(kwargs)
 
@@ -249,9 +282,41 @@ class BaseObject(Field, metaclass=BaseObjectMeta):
                     )
                 )
             value = field.to_value(value)
+            if (
+                self._cache
+                and name in self._cached_fields
+                and getattr(self, name, None) != value
+            ):
+                self._cache.clear()
 
         super().__setattr__(name, value)
 
+    def __setstate__(self, state):
+        # Copied and unpickled objects are restored without validation. State of
+        # objects without __dict__ is a tuple of (None, slot values).
+        _, slots = state
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
+
+    def invalidate_cache(self):
+        """Clears cached values derived from fields. Changing mutable fields (eg.
+        dictionaries or lists) in place isn't detected, so this needs to be called
+        manually in that case.
+        """
+        self._cache.clear()
+
+    # Trusted populate functions bypass validating __setattr__ and set values
+    # directly to slots
+    def _populate_trusted_from_instance(self, instance):
+        for field in self._fields:
+            object.__setattr__(
+                self, field.name, getattr(instance, field.name, field.default)
+            )
+
+    def _populate_trusted_from_dict(self, data):
+        for field in self._fields:
+            object.__setattr__(self, field.name, data.get(field.attr, field.default))
+
     def _populate_from_instance(self, instance):
         for field in self._fields:
             self.__setattr__(field.name, getattr(instance, field.name, field.default))
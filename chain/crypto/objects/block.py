@@ -1,8 +1,10 @@
 from binascii import hexlify, unhexlify
+from collections.abc import Sequence
 from hashlib import sha256
+from struct import Struct, pack
+from time import perf_counter
 
 # import avocato
-from binary.unsigned_integer import write_bit32, write_bit64
 
 from chain.common.config import config
 from chain.crypto import slots, time
@@ -16,14 +18,97 @@ from chain.crypto.objects.base import (
 )
 from chain.crypto.objects.transactions import (
     BaseTransaction,
+    from_buffer,
     from_dict,
     from_serialized,
 )
 from chain.crypto.utils import verify_hash
+from chain.crypto.verification import verify_transactions
 from chain.crypto.objects.base import BaseObject
 
+# Precompiled block header layouts, keyed by whether the milestone uses full
+# SHA256 block ids (32 byte previous block id) or not (8 byte previous block id).
+# version, timestamp, height, previous block, number of transactions,
+# total amount, total fee, reward, payload length, payload hash, generator public key
+_HEADER_LAYOUTS = {
+    True: Struct("<III32sIQQQI32s33s"),
+    False: Struct("<III8sIQQQI32s33s"),
+}
 
 
+# Number of runs and total time in seconds spent in each block verification stage
+_verification_stage_timings = {}
+
+
+def _record_verification_stage(stage, duration):
+    timing = _verification_stage_timings.setdefault(stage, [0, 0.0])
+    timing[0] += 1
+    timing[1] += duration
+
+
+def get_verification_stage_timings():
+    """Returns number of runs and total time in seconds spent in each block
+    verification stage
+
+    :returns (dict): {stage name: {"count": int, "total_time": float}}
+    """
+    return {
+        stage.lstrip("_"): {"count": count, "total_time": total_time}
+        for stage, (count, total_time) in _verification_stage_timings.items()
+    }
+
+
+def reset_verification_stage_timings():
+    _verification_stage_timings.clear()
+
+
+class LazyTransactions(Sequence):
+    """Sequence of transactions of a deserialized block, where each transaction is
+    deserialized only when it's accessed for the first time. This way blocks that
+    get rejected early only pay for deserializing the block header.
+
+    :param memoryview view: serialized transactions, one after another
+    :param list lengths: lengths of serialized transactions
+    """
+
+    __slots__ = ("_view", "_offsets", "_transactions", "block_id")
+
+    def __init__(self, view, lengths):
+        self._view = view
+        self._offsets = []
+        offset = 0
+        for length in lengths:
+            self._offsets.append(offset)
+            offset += length
+        self._offsets.append(offset)
+        self._transactions = [None] * len(lengths)
+        # Block id that is set to transactions when they're deserialized
+        self.block_id = None
+
+    def __len__(self):
+        return len(self._transactions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        # Normalize negative indexes and raise IndexError if out of range
+        index = range(len(self._transactions))[index]
+        transaction = self._transactions[index]
+        if transaction is None:
+            start = self._offsets[index]
+            end = self._offsets[index + 1]
+            transaction = from_buffer(ByteBuffer(self._view[start:end]))
+            # override blockId so all transactions match with the current block and
+            # add sequence to keep the data in sequence when storing it to db
+            transaction.block_id = self.block_id
+            transaction.sequence = index
+            self._transactions[index] = transaction
+        return transaction
+
+    def __setitem__(self, index, transaction):
+        self._transactions[index] = transaction
+
 
 class Block(BaseObject):
     id = StrField(attr="id", required=False, default=None)
@@ -73,7 +158,10 @@ class Block(BaseObject):
             self.id_hex = self.get_id_hex()
             self.id = self.get_id()
 
-        if self.transactions:
+        if isinstance(self.transactions, LazyTransactions):
+            # Lazy transactions get block id and sequence when they're deserialized
+            self.transactions.block_id = self.id
+        elif self.transactions:
             for index, transaction in enumerate(self.transactions):
                 # override blockId and timestamp so all transactions match
                 # with the current block
@@ -85,6 +173,7 @@ class Block(BaseObject):
                 # add sequence to keep the data in sequence when storing it to db
                 transaction.sequence = index
 
+        if self.transactions:
             # // order of transactions messed up in mainnet V1
             # // TODO: move this to network constants exception using block ids
             if self.number_of_transactions == 2 and (
@@ -135,11 +224,17 @@ class Block(BaseObject):
         return cls
 
     @classmethod
-    def from_object(cls, data):
+    def from_object(cls, data, trusted=False):
+        """Creates a block from an object with the same attributes (eg. database model)
+
+        :param object data: object to create the block from
+        :param bool trusted: if True, attribute values are not validated. Use only
+            for already validated data (eg. blocks from our own database).
+        """
         # if not isinstance(data, dict):
         #     raise TypeError('Data must be in dictionary format')
         # fields = cls._fields
-        cls = cls(instance=data)
+        cls = cls(instance=data, trusted=trusted)
         # for field in fields:
         #     value = getattr(data, field.name, field.default)
         #     if value is None and field.required:
@@ -170,13 +265,30 @@ class Block(BaseObject):
     def from_serialized(cls, bytes_string):
         if not isinstance(bytes_string, bytes):
             raise TypeError("bytes_string must be bytes")
+        return cls.from_bytes(unhexlify(bytes_string))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Creates a block from raw serialized data (see `to_bytes`)
+
+        :param data: bytes-like object (`bytes`, `bytearray` or `memoryview`)
+        """
         cls = cls()
-        cls.deserialize(bytes_string)
+        cls._deserialize_buffer(ByteBuffer(data))
         cls._construct_common()
         return cls
 
+    def to_bytes(self):
+        """Serializes block together with its transactions to raw bytes. This is
+        the format used internally (eg. process queue), hex is only used when
+        talking to other nodes.
+
+        :returns (bytes): serialized block
+        """
+        return self.serialize_full(raw=True)
+
     def get_id_hex(self):
-        payload_hash = unhexlify(self.serialize())
+        payload_hash = self.serialize(raw=True)
         full_hash = sha256(payload_hash).digest()
         milestone = config.get_milestone(self.height)
         if milestone["block"]["idFullSha256"]:
@@ -192,9 +304,16 @@ class Block(BaseObject):
             return id_hex.decode("utf-8")
         return str(int(id_hex, 16))
 
-    def serialize(self, include_signature=True):
+    def serialize(self, include_signature=True, raw=False):
+        """Serialize block header
+
+        :param bool include_signature: if True, block signature is included
+        :param bool raw: if True, returns raw bytes instead of hex
+        :returns (bytes): serialized block header as hex or raw bytes
+        """
         milestone = config.get_milestone(self.height - 1)
-        if milestone["block"]["idFullSha256"]:
+        id_full_sha256 = milestone["block"]["idFullSha256"]
+        if id_full_sha256:
             if len(self.previous_block) != 64:
                 raise Exception(
                     "Previous block shoud be SHA256, but found a non SHA256 block id"
@@ -203,49 +322,59 @@ class Block(BaseObject):
         else:
             self.previous_block_hex = Block.to_bytes_hex(self.previous_block)
 
-        bytes_data = bytes()
-        bytes_data += write_bit32(self.version)
-        bytes_data += write_bit32(self.timestamp)
-        bytes_data += write_bit32(self.height)
-        bytes_data += unhexlify(self.previous_block_hex)
-        bytes_data += write_bit32(self.number_of_transactions)
-        bytes_data += write_bit64(int(self.total_amount))
-        bytes_data += write_bit64(int(self.total_fee))
-        bytes_data += write_bit64(int(self.reward))
-        bytes_data += write_bit32(self.payload_length)
-        bytes_data += unhexlify(self.payload_hash.encode("utf-8"))
-        bytes_data += unhexlify(self.generator_public_key)
+        bytes_data = _HEADER_LAYOUTS[bool(id_full_sha256)].pack(
+            self.version,
+            self.timestamp,
+            self.height,
+            unhexlify(self.previous_block_hex),
+            self.number_of_transactions,
+            int(self.total_amount),
+            int(self.total_fee),
+            int(self.reward),
+            self.payload_length,
+            unhexlify(self.payload_hash.encode("utf-8")),
+            unhexlify(self.generator_public_key),
+        )
 
         if include_signature and self.block_signature:
             bytes_data += unhexlify(self.block_signature.encode("utf-8"))
 
+        if raw:
+            return bytes_data
         return hexlify(bytes_data)
 
-    def serialize_full(self):
+    def serialize_full(self, raw=False):
+        """Serialize block header together with all of its transactions
+
+        :param bool raw: if True, returns raw bytes instead of hex
+        :returns (bytes): serialized block as hex or raw bytes
+        """
         if not self.transactions:
             self.transactions = []
         if not self.number_of_transactions:
             self.number_of_transactions = len(self.transactions)
 
-        bytes_data = unhexlify(self.serialize())
-
-        all_transaction_bytes = bytes()
-        for transaction in self.transactions:
-            serialized_transaction = unhexlify(transaction.serialize())
-            bytes_data += write_bit32(len(serialized_transaction))
-            all_transaction_bytes += serialized_transaction
-
-        bytes_data += all_transaction_bytes
+        serialized_transactions = [
+            transaction.serialize(raw=True) for transaction in self.transactions
+        ]
+        lengths = [len(transaction) for transaction in serialized_transactions]
+        bytes_data = b"".join(
+            [self.serialize(raw=True), pack("<{}I".format(len(lengths)), *lengths)]
+            + serialized_transactions
+        )
+        if raw:
+            return bytes_data
         return hexlify(bytes_data)
 
     def _deserialize_transactions(self, buff):
         transaction_lenghts = []
         for _ in range(self.number_of_transactions):
             transaction_lenghts.append(buff.pop_uint32())
-        self.transactions = []
-        for trans_len in transaction_lenghts:
-            serialized_hex = hexlify(buff.pop_bytes(trans_len))
-            self.transactions.append(from_serialized(serialized_hex))
+        # Transactions are deserialized when they're accessed. Slice them out of
+        # the block buffer without copying the data.
+        self.transactions = LazyTransactions(
+            buff.pop_view(sum(transaction_lenghts)), transaction_lenghts
+        )
 
     def _deserialize_previous_block(self, buff):
         """
@@ -254,15 +383,17 @@ class Block(BaseObject):
         """
         milestone = config.get_milestone(self.height - 1)
         if milestone["block"]["idFullSha256"]:
-            self.previous_block_hex = hexlify(buff.pop_bytes(32))
+            self.previous_block_hex = buff.pop_view(32).hex().encode("utf-8")
             self.previous_block = self.previous_block_hex.decode("utf-8")
         else:
 
-            self.previous_block_hex = hexlify(buff.pop_bytes(8))
+            self.previous_block_hex = buff.pop_view(8).hex().encode("utf-8")
             self.previous_block = str(int(self.previous_block_hex, 16))
 
     def deserialize(self, serialized_hex):
-        buff = ByteBuffer(unhexlify(serialized_hex))
+        self._deserialize_buffer(ByteBuffer(unhexlify(serialized_hex)))
+
+    def _deserialize_buffer(self, buff):
         self.version = buff.pop_uint32()
         self.timestamp = buff.pop_uint32()
         self.height = buff.pop_uint32()
@@ -272,12 +403,12 @@ class Block(BaseObject):
         self.total_fee = buff.pop_uint64()
         self.reward = buff.pop_uint64()
         self.payload_length = buff.pop_uint32()
-        self.payload_hash = hexlify(buff.pop_bytes(32)).decode("utf-8")
-        self.generator_public_key = hexlify(buff.pop_bytes(33)).decode("utf-8")
+        self.payload_hash = buff.pop_view(32).hex()
+        self.generator_public_key = buff.pop_view(33).hex()
         # TODO: test the case where block signature is not present
-        signature_len = int(hexlify(buff.read_bytes(1, offset=1)), 16)
+        signature_len = buff.read_uint8(offset=1)
         signature_to = signature_len + 2
-        self.block_signature = hexlify(buff.pop_bytes(signature_to)).decode("utf-8")
+        self.block_signature = buff.pop_view(signature_to).hex()
 
         if len(buff) != 0:
             self._deserialize_transactions(buff)
@@ -292,7 +423,7 @@ class Block(BaseObject):
     def verify_signature(self):
         """Verify signature associated with this block
         """
-        bytes_data = unhexlify(self.serialize(include_signature=False))
+        bytes_data = self.serialize(include_signature=False, raw=True)
         is_verified = verify_hash(
             bytes_data,
             unhexlify(self.block_signature.encode("utf-8")),
@@ -300,11 +431,8 @@ class Block(BaseObject):
         )
         return is_verified
 
-    def verify(self):
+    def _verify_header(self, milestone):
         errors = []
-
-        # TODO: find a better way to get milestone data
-        milestone = config.get_milestone(self.height)
         # Check that the previous block is set if it's not a genesis block
         if self.height > 1 and not self.previous_block:
             errors.append("Invalid previous block")
@@ -317,11 +445,6 @@ class Block(BaseObject):
                 )
             )
 
-        # Verify block signature
-        is_valid_signature = self.verify_signature()
-        if not is_valid_signature:
-            errors.append("Failed to verify block signature")
-
         # Check if version is correct on the block
         if self.version != milestone["block"]["version"]:
             errors.append("Invalid block version")
@@ -332,15 +455,10 @@ class Block(BaseObject):
         ) > slots.get_slot_number(self.height, time.get_time())
         if is_invalid_timestamp:
             errors.append("Invalid block timestamp")
+        return errors
 
-        # Check if all transactions are valid
-        invalid_transactions = [
-            trans for trans in self.transactions if not trans.verify()
-        ]
-
-        if len(invalid_transactions) > 0:
-            errors.append("One or more transactions are not verified")
-
+    def _verify_number_of_transactions(self, milestone):
+        errors = []
         # Check that number of transactions and block.number_of_transactions match
         if len(self.transactions) != self.number_of_transactions:
             errors.append("Invalid number of transactions")
@@ -351,22 +469,25 @@ class Block(BaseObject):
             and len(self.transactions) > milestone["block"]["maxTransactions"]
         ):
             errors.append("Too many transactions")
+        return errors
 
+    def _verify_payload(self, milestone):
+        errors = []
         # Check if transactions add up to the block values
-        applied_transactions = []
+        applied_transactions = set()
         total_amount = 0
         total_fee = 0
-        bytes_data = bytes()
+        transaction_ids = []
         for transaction in self.transactions:
             if transaction.id in applied_transactions:
                 errors.append(
                     "Encountered duplicate transaction: {}".format(transaction.id)
                 )
 
-            applied_transactions.append(transaction.id)
+            applied_transactions.add(transaction.id)
             total_amount += transaction.amount
             total_fee += transaction.fee
-            bytes_data += unhexlify(transaction.id)
+            transaction_ids.append(unhexlify(transaction.id))
 
         if total_amount != self.total_amount:
             errors.append("Invalid total amount")
@@ -374,11 +495,51 @@ class Block(BaseObject):
         if total_fee != self.total_fee:
             errors.append("Invalid total fee")
 
+        bytes_data = b"".join(transaction_ids)
         if len(bytes_data) > milestone["block"]["maxPayload"]:
             errors.append("Payload is too large")
 
         if sha256(bytes_data).hexdigest() != self.payload_hash:
             errors.append("Invalid payload hash")
+        return errors
+
+    def _verify_block_signature(self, milestone):
+        if not self.verify_signature():
+            return ["Failed to verify block signature"]
+        return []
+
+    def _verify_transaction_signatures(self, milestone):
+        if not all(verify_transactions(self.transactions)):
+            return ["One or more transactions are not verified"]
+        return []
+
+    # Verification stages, ordered from the cheapest to the most expensive one, so
+    # that invalid blocks are rejected before doing any signature verification
+    _verification_stages = (
+        "_verify_header",
+        "_verify_number_of_transactions",
+        "_verify_payload",
+        "_verify_block_signature",
+        "_verify_transaction_signatures",
+    )
+
+    def verify(self, early_exit=False):
+        """Verifies the block and its transactions
+
+        :param bool early_exit: if True, verification stops after the first stage
+            that finds errors
+        :returns (tuple): tuple of (is verified, list of errors)
+        """
+        errors = []
+
+        # TODO: find a better way to get milestone data
+        milestone = config.get_milestone(self.height)
+        for stage in self._verification_stages:
+            start = perf_counter()
+            errors.extend(getattr(self, stage)(milestone))
+            _record_verification_stage(stage, perf_counter() - start)
+            if early_exit and errors:
+                break
 
         return len(errors) == 0, errors
 
@@ -397,5 +558,8 @@ class Block(BaseObject):
         # TODO: figure out another name for this as it's not really json, its a
         # dictionary but with the camelcase names as keys
         data = self.get_header()
-        data["transactions"] = [t.to_json() for t in self.transactions]
+        # Transactions can also be serialized (hex), which are sent as they are
+        data["transactions"] = [
+            t if isinstance(t, str) else t.to_json() for t in self.transactions
+        ]
         return data
@@ -1,6 +1,10 @@
+import logging
 from binascii import unhexlify
+from concurrent.futures.process import BrokenProcessPool
 
+from chain.common.config import config
 from chain.crypto.bytebuffer import ByteBuffer
+from chain.crypto.executor import get_executor, shutdown_executor
 from chain.crypto.constants import (
     TRANSACTION_TYPE_DELEGATE_REGISTRATION,
     TRANSACTION_TYPE_DELEGATE_RESIGNATION,
@@ -24,6 +28,8 @@ from .timelock_transfer import TimelockTransferTransaction
 from .transfer import TransferTransaction
 from .vote import VoteTransaction
 
+logger = logging.getLogger(__name__)
+
 # TODO: Make this somewhat dynamic so people can install new transaction types
 # directly from pip and map it (or something like that)
 TRANSACTION_TYPE_MAPPING = {
@@ -43,16 +49,90 @@ def from_serialized(serialized_hex):
     if not isinstance(serialized_hex, bytes):
         raise TypeError("serialized_hex must be bytes")
 
-    buff = ByteBuffer(unhexlify(serialized_hex))
-    buff.pop_bytes(3)  # skip first 3 bytes (marker, version and network)
-    transaction_type = buff.pop_uint8()
+    return from_bytes(unhexlify(serialized_hex))
+
+
+def from_bytes(data):
+    """Creates a transaction from raw serialized data
+
+    :param data: bytes-like object (`bytes`, `bytearray` or `memoryview`)
+    """
+    return from_buffer(ByteBuffer(data))
+
+
+def _from_joined_bytes(data, lengths):
+    """Deserializes transactions that are stored one after another in `data`
+
+    :param bytes data: serialized transactions joined together
+    :param list lengths: lengths of serialized transactions
+    :returns (list): list of crypto transactions
+    """
+    view = memoryview(data)
+    transactions = []
+    offset = 0
+    for length in lengths:
+        transactions.append(from_buffer(ByteBuffer(view[offset : offset + length])))
+        offset += length
+    return transactions
+
+
+def from_bytes_many(payloads):
+    """Deserializes many transactions at once and returns them in the same order
+
+    If there are enough transactions, they are split into chunks, each joined into
+    a single buffer and deserialized in a process pool, otherwise they're
+    deserialized in the current process.
+
+    :param list payloads: list of raw serialized transactions
+    :returns (list): list of crypto transactions
+    """
+    settings = config.crypto["parallel_deserialization"]
+    if not settings["enabled"] or len(payloads) < settings["min_transactions"]:
+        return [from_bytes(payload) for payload in payloads]
+
+    chunk_size = settings["chunk_size"]
+    chunks = [
+        payloads[index : index + chunk_size]
+        for index in range(0, len(payloads), chunk_size)
+    ]
+    try:
+        transactions = []
+        for chunk_transactions in get_executor().map(
+            _from_joined_bytes,
+            [b"".join(chunk) for chunk in chunks],
+            [[len(payload) for payload in chunk] for chunk in chunks],
+        ):
+            transactions.extend(chunk_transactions)
+        return transactions
+    except BrokenProcessPool:
+        logger.exception(
+            "Process pool for deserialization is broken. Deserializing "
+            "transactions in the current process"
+        )
+        shutdown_executor()
+        return [from_bytes(payload) for payload in payloads]
+
+
+def from_serialized_many(serialized_hexes):
+    """Same as `from_bytes_many`, but for hex encoded transactions
+
+    :param list serialized_hexes: list of serialized transactions as hex
+    :returns (list): list of crypto transactions
+    """
+    return from_bytes_many([unhexlify(serialized) for serialized in serialized_hexes])
+
+
+def from_buffer(buff):
+    # Transaction type is stored after the first 3 bytes (marker, version and
+    # network)
+    transaction_type = buff.read_uint8(offset=3)
 
     transaction_cls = TRANSACTION_TYPE_MAPPING.get(transaction_type)
     if not transaction_cls:
         raise ValueError(
             "Couldn't find transaction type {} in mapping".format(transaction_type)
         )
-    return transaction_cls.from_serialized(serialized_hex)
+    return transaction_cls.from_buffer(buff)
 
 
 def from_dict(data):
@@ -67,10 +147,10 @@ def from_dict(data):
     return transaction_cls.from_dict(data)
 
 
-def from_object(data):
+def from_object(data, trusted=False):
     transaction_cls = TRANSACTION_TYPE_MAPPING.get(data.type)
     if not transaction_cls:
         raise ValueError(
             "Couldn't find transaction type {} in mapping".format(data.type)
         )
-    return transaction_cls.from_object(data)
+    return transaction_cls.from_object(data, trusted=trusted)
@@ -1,15 +1,12 @@
 import logging
 from binascii import hexlify, unhexlify
 from hashlib import sha256
-from struct import pack
+from struct import Struct
 
 from chain.crypto.objects.base import BaseObject
 
 from base58 import b58decode_check, b58encode_check
 
-from binary.hex import write_high
-from binary.unsigned_integer import write_bit32, write_bit64, write_bit8
-
 from chain.common.config import config
 from chain.crypto.address import address_from_public_key
 from chain.crypto.bytebuffer import ByteBuffer
@@ -34,9 +31,38 @@ from chain.crypto.objects.base import (
     StrField,
 )
 from chain.crypto.utils import is_transaction_exception, verify_hash
+from chain.crypto.verification import verify_second_signatures
 
 logger = logging.getLogger(__name__)
 
+# Precompiled layouts of fixed size parts of serialized transactions
+_UINT8 = Struct("<B")
+_UINT32 = Struct("<I")
+# marker, version, network, type, timestamp, sender public key, fee
+_HEADER_LAYOUT = Struct("<BBBBI33sQ")
+# Transaction type specific data that has a fixed size
+_TYPE_LAYOUTS = {
+    # amount, expiration, recipient
+    TRANSACTION_TYPE_TRANSFER: Struct("<QI21s"),
+    # second public key
+    TRANSACTION_TYPE_SECOND_SIGNATURE: Struct("<33s"),
+    # amount, timelock type, timelock, recipient
+    TRANSACTION_TYPE_TIMELOCK_TRANSFER: Struct("<QBQ21s"),
+}
+# min, number of keys, lifetime
+_MULTI_SIGNATURE_LAYOUT = Struct("<BBB")
+# amount, recipient
+_PAYMENT_LAYOUT = Struct("<Q21s")
+
+# Layouts used for legacy bytes (prior to AIP11)
+# type, timestamp, sender public key, recipient
+_LEGACY_HEADER_LAYOUT = Struct("<BI33s21s")
+# amount, fee
+_LEGACY_AMOUNTS_LAYOUT = Struct("<QQ")
+# min, lifetime
+_LEGACY_MULTI_SIGNATURE_LAYOUT = Struct("<BB")
+_EMPTY_VENDOR_FIELD = bytes(64)
+
 
 class BaseTransaction(BaseObject):
     version = IntField(attr="version", required=False, default=None)
@@ -64,6 +90,10 @@ class BaseTransaction(BaseObject):
     # TODO: What kind of a field is this?
     payments = Field(attr="payments", required=False)
 
+    # Id is derived from the bytes, block id and sequence are only set when the
+    # transaction is included in a block or added to the pool
+    _uncached_fields = ("id", "block_id", "sequence")
+
     # TODO: test
     def _construct_common(self):
         self._apply_v1_compatibility()
@@ -81,8 +111,25 @@ class BaseTransaction(BaseObject):
     def from_serialized(cls, bytes_string):
         if not isinstance(bytes_string, bytes):
             raise TypeError("bytes_string must be bytes")
+        return cls.from_bytes(unhexlify(bytes_string))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Creates a transaction from raw serialized data (see `to_bytes`)
+
+        :param data: bytes-like object (`bytes`, `bytearray` or `memoryview`)
+        """
+        return cls.from_buffer(ByteBuffer(data))
+
+    @classmethod
+    def from_buffer(cls, buff):
+        """Creates a transaction from a ByteBuffer that holds raw serialized
+        transaction data
+
+        :param ByteBuffer buff: buffer positioned at the start of the transaction
+        """
         cls = cls()
-        cls.deserialize(bytes_string)
+        cls._deserialize_buffer(buff)
         cls._construct_common()
 
         for field in cls._fields:
@@ -95,9 +142,15 @@ class BaseTransaction(BaseObject):
         return cls
 
     @classmethod
-    def from_object(cls, data):
-        print(data.__dict__)
-        cls = cls(instance=data)
+    def from_object(cls, data, trusted=False):
+        """Creates a transaction from an object with the same attributes (eg.
+        database model)
+
+        :param object data: object to create the transaction from
+        :param bool trusted: if True, attribute values are not validated. Use only
+            for already validated data (eg. transactions from our own database).
+        """
+        cls = cls(instance=data, trusted=trusted)
         cls._construct_common()
         return cls
 
@@ -111,45 +164,36 @@ class BaseTransaction(BaseObject):
     def _serialize_vendor_field(self):
         """Serialize vendor field of the transaction
         """
-        bytes_data = bytes()
         if BaseTransaction.can_have_vendor_field(self.type) and self.vendor_field:
             data = self.vendor_field.encode("utf-8")
-            bytes_data += write_bit8(len(data))
-            bytes_data += data
-            return bytes_data
+            return _UINT8.pack(len(data)) + data
         else:
-            bytes_data += write_bit8(0x00)
-            return bytes_data
+            return _UINT8.pack(0x00)
 
     def _serialize_type(self):
         """Serialize transaction specific data (eg. delegate registration)
         """
-        bytes_data = bytes()
-
         if self.type == TRANSACTION_TYPE_TRANSFER:
-            bytes_data += write_bit64(self.amount)
-            bytes_data += write_bit32(self.expiration or 0)
-            bytes_data += write_high(hexlify(b58decode_check(self.recipient_id)))
+            return _TYPE_LAYOUTS[TRANSACTION_TYPE_TRANSFER].pack(
+                self.amount, self.expiration or 0, b58decode_check(self.recipient_id)
+            )
 
         elif self.type == TRANSACTION_TYPE_SECOND_SIGNATURE:
-            bytes_data += unhexlify(
-                self.asset["signature"]["publicKey"].encode("utf-8")
+            return _TYPE_LAYOUTS[TRANSACTION_TYPE_SECOND_SIGNATURE].pack(
+                unhexlify(self.asset["signature"]["publicKey"].encode("utf-8"))
             )
 
         elif self.type == TRANSACTION_TYPE_DELEGATE_REGISTRATION:
-            delegate_bytes = hexlify(self.asset["delegate"]["username"].encode("utf-8"))
-            bytes_data += write_bit8(len(delegate_bytes))
-            bytes_data += unhexlify(delegate_bytes)
+            delegate_bytes = self.asset["delegate"]["username"].encode("utf-8")
+            # Length is the length of hex encoded username
+            return _UINT8.pack(len(delegate_bytes) * 2) + delegate_bytes
 
         elif self.type == TRANSACTION_TYPE_VOTE:
-            vote_bytes = []
+            vote_bytes = [_UINT8.pack(len(self.asset["votes"]))]
             for vote in self.asset["votes"]:
-                if vote.startswith("+"):
-                    vote_bytes.append("01{}".format(vote[1:]))
-                else:
-                    vote_bytes.append("00{}".format(vote[1:]))
-            bytes_data += write_bit8(len(self.asset["votes"]))
-            bytes_data += unhexlify("".join(vote_bytes))
+                vote_bytes.append(b"\x01" if vote.startswith("+") else b"\x00")
+                vote_bytes.append(unhexlify(vote[1:]))
+            return b"".join(vote_bytes)
 
         elif self.type == TRANSACTION_TYPE_MULTI_SIGNATURE:
             keysgroup = []
@@ -159,71 +203,98 @@ class BaseTransaction(BaseObject):
             else:
                 keysgroup = self.asset["multisignature"]["keysgroup"]
 
-            bytes_data += write_bit8(self.asset["multisignature"]["min"])
-            bytes_data += write_bit8(len(self.asset["multisignature"]["keysgroup"]))
-            bytes_data += write_bit8(self.asset["multisignature"]["lifetime"])
-            bytes_data += unhexlify("".join(keysgroup).encode("utf-8"))
+            return _MULTI_SIGNATURE_LAYOUT.pack(
+                self.asset["multisignature"]["min"],
+                len(self.asset["multisignature"]["keysgroup"]),
+                self.asset["multisignature"]["lifetime"],
+            ) + unhexlify("".join(keysgroup).encode("utf-8"))
 
         elif self.type == TRANSACTION_TYPE_IPFS:
-            bytes_data += write_bit8(len(self.asset["ipfs"]["dag"]) // 2)
-            bytes_data += unhexlify(self.asset["ipfs"]["dag"])
+            return _UINT8.pack(len(self.asset["ipfs"]["dag"]) // 2) + unhexlify(
+                self.asset["ipfs"]["dag"]
+            )
 
         elif self.type == TRANSACTION_TYPE_TIMELOCK_TRANSFER:
-            bytes_data += write_bit64(self.amount)
-            bytes_data += write_bit8(self.timelock_type)
-            bytes_data += write_bit64(self.timelock)
-            bytes_data += b58decode_check(self.recipient_id)
+            return _TYPE_LAYOUTS[TRANSACTION_TYPE_TIMELOCK_TRANSFER].pack(
+                self.amount,
+                self.timelock_type,
+                self.timelock,
+                b58decode_check(self.recipient_id),
+            )
 
         elif self.type == TRANSACTION_TYPE_MULTI_PAYMENT:
-            bytes_data += write_bit32(len(self.asset["payments"]))
+            payment_bytes = [_UINT32.pack(len(self.asset["payments"]))]
             for payment in self.asset["payments"]:
-                bytes_data += write_bit64(payment["amount"])
-                bytes_data += b58decode_check(payment["recipientId"])
+                payment_bytes.append(
+                    _PAYMENT_LAYOUT.pack(
+                        payment["amount"], b58decode_check(payment["recipientId"])
+                    )
+                )
+            return b"".join(payment_bytes)
 
         elif self.type == TRANSACTION_TYPE_DELEGATE_RESIGNATION:
-            pass
+            return b""
         else:
             raise Exception("Transaction type is invalid")  # TODO: better exception
-        return bytes_data
 
     def _serialize_signatures(self):
         """Serialize signature data of the transaction
         """
-        bytes_data = bytes()
+        signature_bytes = []
         if self.signature:
-            bytes_data += unhexlify(self.signature)
+            signature_bytes.append(unhexlify(self.signature))
 
             if self.second_signature:
-                bytes_data += unhexlify(self.second_signature)
+                signature_bytes.append(unhexlify(self.second_signature))
             elif self.sign_signature:
-                bytes_data += unhexlify(self.sign_signature)
+                signature_bytes.append(unhexlify(self.sign_signature))
 
             if self.signatures:
                 # add 0xff separator to signal start of multi-signature transactions
-                bytes_data += write_bit8(0xFF)
-                bytes_data += unhexlify("".join(self.signatures))
+                signature_bytes.append(_UINT8.pack(0xFF))
+                signature_bytes.append(unhexlify("".join(self.signatures)))
 
-        return bytes_data
+        return b"".join(signature_bytes)
 
-    def serialize(self):
-        """Serialize Transaction
-        """
-        bytes_data = bytes()  # bytes() or bytes(512)?
-        bytes_data += write_bit8(0xFF)  # fill, to distinguish between v1 and v2
-        bytes_data += write_bit8(self.version or 0x01)
-        bytes_data += write_bit8(self.network or config.network["pubKeyHash"])
-        bytes_data += write_bit8(self.type)
-        bytes_data += write_bit32(self.timestamp)
-        bytes_data += write_high(self.sender_public_key.encode("utf-8"))
-        bytes_data += write_bit64(self.fee)
-
-        # TODO: test this thorougly as it might be completely wrong
-        bytes_data += self._serialize_vendor_field()
-        bytes_data += self._serialize_type()
-        bytes_data += self._serialize_signatures()
+    def serialize(self, raw=False):
+        """Serialize Transaction. Raw result is cached until one of the transaction
+        fields changes.
 
+        :param bool raw: if True, returns raw bytes instead of hex
+        :returns (bytes): serialized transaction as hex or raw bytes
+        """
+        bytes_data = self._cache.get("serialized")
+        if bytes_data is None:
+            bytes_data = self._serialize()
+            self._cache["serialized"] = bytes_data
+        if raw:
+            return bytes_data
         return hexlify(bytes_data)
 
+    def get_serialized_length(self):
+        """Returns length of serialized transaction in bytes
+        """
+        return len(self.serialize(raw=True))
+
+    def _serialize(self):
+        return b"".join(
+            [
+                _HEADER_LAYOUT.pack(
+                    0xFF,  # fill, to distinguish between v1 and v2
+                    self.version or 0x01,
+                    self.network or config.network["pubKeyHash"],
+                    self.type,
+                    self.timestamp,
+                    unhexlify(self.sender_public_key.encode("utf-8")),
+                    self.fee,
+                ),
+                # TODO: test this thorougly as it might be completely wrong
+                self._serialize_vendor_field(),
+                self._serialize_type(),
+                self._serialize_signatures(),
+            ]
+        )
+
     def _deserialize_type(self, buff):
         # TODO: test this extensively
         if self.type == TRANSACTION_TYPE_TRANSFER:
@@ -232,9 +303,7 @@ class BaseTransaction(BaseObject):
             self.recipient_id = b58encode_check(buff.pop_bytes(21)).decode("utf-8")
 
         elif self.type == TRANSACTION_TYPE_SECOND_SIGNATURE:
-            self.asset["signature"] = {
-                "publicKey": hexlify(buff.pop_bytes(33)).decode("utf-8")
-            }
+            self.asset["signature"] = {"publicKey": buff.pop_view(33).hex()}
 
         elif self.type == TRANSACTION_TYPE_DELEGATE_REGISTRATION:
             username_length = buff.pop_uint8()
@@ -247,7 +316,7 @@ class BaseTransaction(BaseObject):
             self.asset["votes"] = []
 
             for _ in range(vote_length):
-                vote = hexlify(buff.pop_bytes(34)).decode("utf-8")
+                vote = buff.pop_view(34).hex()
                 operator = "+" if vote[1] == "1" else "-"
                 self.asset["votes"].append("{}{}".format(operator, vote[2:]))
 
@@ -258,14 +327,12 @@ class BaseTransaction(BaseObject):
             self.asset["multisignature"]["lifetime"] = buff.pop_uint8()
 
             for _ in range(keys_num):
-                key = hexlify(buff.pop_bytes(33)).decode("utf-8")
+                key = buff.pop_view(33).hex()
                 self.asset["multisignature"]["keysgroup"].append(key)
 
         elif self.type == TRANSACTION_TYPE_IPFS:
             dag_length = buff.pop_uint8()
-            self.asset["ipfs"] = {
-                "dag": hexlify(buff.pop_bytes(dag_length)).decode("utf-8")
-            }
+            self.asset["ipfs"] = {"dag": buff.pop_view(dag_length).hex()}
 
         elif self.type == TRANSACTION_TYPE_TIMELOCK_TRANSFER:
             self.amount = buff.pop_uint64()
@@ -308,8 +375,8 @@ class BaseTransaction(BaseObject):
         # hexlify(buff.pop_bytes(33)).decode("utf-8")
 
         if len(buff) > 0:
-            signature_length = int(hexlify(buff.read_bytes(1, offset=1)), 16) + 2
-            self.signature = hexlify(buff.pop_bytes(signature_length)).decode("utf-8")
+            signature_length = buff.read_uint8(offset=1) + 2
+            self.signature = buff.pop_view(signature_length).hex()
 
         # Second signature
         if len(buff) > 0:
@@ -319,20 +386,12 @@ class BaseTransaction(BaseObject):
                 # Multiple signatures
                 self.signatures = []
                 while len(buff) > 0:
-                    multi_signature_length = (
-                        int(hexlify(buff.read_bytes(1, offset=1)), 16) + 2
-                    )
-                    self.signatures.append(
-                        hexlify(buff.pop_bytes(multi_signature_length)).decode("utf-8")
-                    )
+                    multi_signature_length = buff.read_uint8(offset=1) + 2
+                    self.signatures.append(buff.pop_view(multi_signature_length).hex())
             else:
                 # Second signature
-                second_signature_length = (
-                    int(hexlify(buff.read_bytes(1, offset=1)), 16) + 2
-                )
-                self.second_signature = hexlify(
-                    buff.pop_bytes(second_signature_length)
-                ).decode("utf-8")
+                second_signature_length = buff.read_uint8(offset=1) + 2
+                self.second_signature = buff.pop_view(second_signature_length).hex()
 
     def _deserialize_schnorr(self, buff):
         raise NotImplementedError
@@ -355,39 +414,56 @@ class BaseTransaction(BaseObject):
                     key = "+{}".format(key)
                 keysgroup.append(key)
             self.asset["multisignature"]["keysgroup"] = keysgroup
+            # Asset is changed in place, which isn't detected by the object
+            self.invalidate_cache()
+
+    def to_bytes(self):
+        """Serializes transaction to raw bytes. This is the format used internally
+        (eg. database), hex is only used when talking to other nodes.
+
+        :returns (bytes): serialized transaction
+        """
+        return self.serialize(raw=True)
 
     def deserialize(self, serialized_hex):
-        buff = ByteBuffer(unhexlify(serialized_hex))
-        buff.pop_bytes(1)  # skip 0xFF marker
+        self._deserialize_buffer(ByteBuffer(unhexlify(serialized_hex)))
+
+    def _deserialize_buffer(self, buff):
+        buff.skip(1)  # skip 0xFF marker
         self.version = buff.pop_uint8()
         self.network = buff.pop_uint8()
         self.type = buff.pop_uint8()
         self.timestamp = buff.pop_uint32()
-        self.sender_public_key = hexlify(buff.pop_bytes(33)).decode("utf-8")
+        self.sender_public_key = buff.pop_view(33).hex()
         self.fee = buff.pop_uint64()
         vendor_length = buff.pop_uint8()
         if vendor_length > 0:
             if BaseTransaction.can_have_vendor_field(self.type):
                 self.vendor_field = buff.pop_bytes(vendor_length).decode("utf-8")
             else:
-                buff.pop_bytes(vendor_length)
+                buff.skip(vendor_length)
 
         self._deserialize_type(buff)
         self._deserialize_signature(buff)
 
     def get_bytes(self, skip_signature=False, skip_second_signature=False):
         """
-        Serializes the given transaction prior to AIP11 (legacy).
+        Serializes the given transaction prior to AIP11 (legacy). Result is cached
+        until one of the transaction fields changes.
         """
+        key = ("bytes", skip_signature, skip_second_signature)
+        if key not in self._cache:
+            self._cache[key] = self._get_bytes(
+                skip_signature=skip_signature,
+                skip_second_signature=skip_second_signature,
+            )
+        return self._cache[key]
+
+    def _get_bytes(self, skip_signature=False, skip_second_signature=False):
         # TODO: rename to to_bytes which makes more sense than get_bytes
         if self.version and self.version != 1:
             raise Exception("Invalid transaction version")  # TODO: better exception
 
-        bytes_data = bytes()
-        bytes_data += write_bit8(self.type)
-        bytes_data += write_bit32(self.timestamp)
-        bytes_data += write_high(self.sender_public_key)
-
         # Apply a fix for broken type 1 (second signature) and 4 (multi signature)
         # transactions, which were erroneously calculated with a recipient id,
         # also apply a fix for all other broken transactions
@@ -399,60 +475,86 @@ class BaseTransaction(BaseObject):
         if not self.recipient_id or (
             is_transaction_exception(self.id) or is_broken_type
         ):
-            bytes_data += pack("21x")
+            # Layout pads empty recipient with zeros
+            recipient = b""
         else:
-            bytes_data += b58decode_check(self.recipient_id)
+            recipient = b58decode_check(self.recipient_id)
+
+        bytes_data = [
+            _LEGACY_HEADER_LAYOUT.pack(
+                self.type, self.timestamp, unhexlify(self.sender_public_key), recipient
+            )
+        ]
 
         if self.vendor_field:
-            encoded_vendor_field = self.vendor_field.encode("utf-8")
-            bytes_data += encoded_vendor_field
-            num_of_zeroes = 64 - len(encoded_vendor_field)
-            if num_of_zeroes > 0:
-                bytes_data += pack("{}x".format(num_of_zeroes))
+            # Vendor field is padded with zeros to 64 bytes
+            bytes_data.append(self.vendor_field.encode("utf-8").ljust(64, b"\x00"))
         else:
-            bytes_data += pack("64x")
+            bytes_data.append(_EMPTY_VENDOR_FIELD)
 
-        bytes_data += write_bit64(self.amount)
-        bytes_data += write_bit64(self.fee)
+        bytes_data.append(_LEGACY_AMOUNTS_LAYOUT.pack(self.amount, self.fee))
 
         if self.type == TRANSACTION_TYPE_SECOND_SIGNATURE:
             public_key = self.asset["signature"]["publicKey"]
-            bytes_data += unhexlify(public_key)
+            bytes_data.append(unhexlify(public_key))
         elif self.type == TRANSACTION_TYPE_DELEGATE_REGISTRATION:
-            bytes_data += self.asset["delegate"]["username"].encode()
+            bytes_data.append(self.asset["delegate"]["username"].encode())
         elif self.type == TRANSACTION_TYPE_VOTE:
-            bytes_data += "".join(self.asset["votes"]).encode()
+            bytes_data.append("".join(self.asset["votes"]).encode())
         elif self.type == TRANSACTION_TYPE_MULTI_SIGNATURE:
-            bytes_data += write_bit8(self.asset["multisignature"]["min"])
-            bytes_data += write_bit8(self.asset["multisignature"]["lifetime"])
-            bytes_data += "".join(self.asset["multisignature"]["keysgroup"]).encode()
+            bytes_data.append(
+                _LEGACY_MULTI_SIGNATURE_LAYOUT.pack(
+                    self.asset["multisignature"]["min"],
+                    self.asset["multisignature"]["lifetime"],
+                )
+            )
+            bytes_data.append(
+                "".join(self.asset["multisignature"]["keysgroup"]).encode()
+            )
 
         if not skip_signature and self.signature:
-            bytes_data += write_high(self.signature)
+            bytes_data.append(unhexlify(self.signature))
 
         if not skip_second_signature and self.sign_signature:
-            bytes_data += write_high(self.sign_signature)
+            bytes_data.append(unhexlify(self.sign_signature))
 
-        return bytes_data
+        return b"".join(bytes_data)
 
-    def verify(self):
+    def get_verification_data(self):
+        """Data needed to verify the transaction signature with `verify_hash`
+
+        :returns (tuple): (message, signature, public key) bytes or None if
+                          transaction can't be verified
+        """
         if self.version and self.version != 1:
-            return False
+            return None
 
         if not self.signature:
-            return False
+            return None
 
         transaction_bytes = self.get_bytes(
             skip_signature=True, skip_second_signature=True
         )
-        is_verified = verify_hash(
+        return (
             transaction_bytes,
             unhexlify(self.signature.encode("utf-8")),
             unhexlify(self.sender_public_key.encode("utf-8")),
         )
-        return is_verified
 
-    def verify_second_signature(self, public_key):
+    def verify(self):
+        """Verifies transaction signature. Use `verify_transactions` to verify
+        multiple transactions and skip the ones that were already verified.
+        """
+        verification_data = self.get_verification_data()
+        return bool(verification_data) and verify_hash(*verification_data)
+
+    def get_second_signature_verification_data(self, public_key):
+        """Data needed to verify the transaction second signature with `verify_hash`
+
+        :param str public_key: second public key of the sender
+        :returns (tuple): (message, signature, public key) bytes or None if
+                          transaction has no second signature
+        """
         if self.version and self.version != 1:
             transaction_bytes = self.get_bytes()
             second_signature = self.second_signature
@@ -461,37 +563,55 @@ class BaseTransaction(BaseObject):
             second_signature = self.sign_signature
 
         if not second_signature:
-            return False
+            return None
 
-        is_verified = verify_hash(
+        return (
             transaction_bytes,
             unhexlify(second_signature.encode("utf-8")),
             unhexlify(public_key.encode("utf-8")),
         )
-        return is_verified
+
+    def set_second_signature_verified(self, public_key, is_verified):
+        """Remembers the result of second signature verification with the public key
+        """
+        self._cache[("second_signature", public_key)] = is_verified
+
+    def verify_second_signature(self, public_key):
+        """Verifies second signature. Signatures that were already verified with
+        the same public key (eg. in a batch with `verify_second_signatures`) are
+        not verified again.
+        """
+        key = ("second_signature", public_key)
+        if key not in self._cache:
+            verify_second_signatures([self], [public_key])
+        return self._cache[key]
 
     def get_hash(self):
         """Generates sha256 hash of bytes.
 
         :returns (str): transaction hash
         """
-        transaction_bytes = self.get_bytes()
-        return sha256(transaction_bytes).hexdigest()
+        if "hash" not in self._cache:
+            transaction_bytes = self.get_bytes()
+            self._cache["hash"] = sha256(transaction_bytes).hexdigest()
+        return self._cache["hash"]
 
     def get_id(self):
         """Generates an ID for current transaction from bytes
 
         :returns (str): transaction id
         """
+        if "id" in self._cache:
+            return self._cache["id"]
+
         transaction_id = self.get_hash()
 
         # Some transactions in the past might have erroneously calculated IDs
         # so if they are defined as exceptions, override the ID with the one defined
         # in exceptions
-        exceptions = config.exceptions.get("transactionIdFixTable", {})
-        if transaction_id in exceptions:
-            transaction_id = exceptions[transaction_id]
+        transaction_id = config.exception_index.fix_transaction_id(transaction_id)
 
+        self._cache["id"] = transaction_id
         return transaction_id
 
     def to_json(self):
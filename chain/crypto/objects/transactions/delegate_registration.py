@@ -76,6 +76,4 @@ class DelegateRegistrationTransaction(BaseTransaction):
         :param (WalletManager) wallet_manager: Wallet manager object
         """
         logger.info("Registering delegate %s", sender.username)
-        wallet_manager.redis.set(
-            wallet_manager.key_for_username(sender.username), sender.address
-        )
+        wallet_manager.save_username(sender.username, sender.address)
@@ -0,0 +1,68 @@
+import logging
+import os
+from hashlib import sha256
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from chain.common.config import config
+
+logger = logging.getLogger(__name__)
+
+_key = "verified_signatures:{}:{}"
+_redis = None
+
+
+def _get_redis():
+    global _redis
+    if _redis is None:
+        _redis = Redis(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=os.environ.get("REDIS_PORT", 6379),
+            db=os.environ.get("REDIS_DB", 0),
+        )
+    return _redis
+
+
+def key_for_transaction(transaction):
+    # Calculated id is used instead of `transaction.id`, so changing any of the
+    # transaction fields results in a different key
+    signature_hash = sha256(transaction.signature.encode("utf-8")).hexdigest()
+    return _key.format(transaction.get_id(), signature_hash)
+
+
+def get_verified(transactions):
+    """Checks which transactions already have a verified signature
+
+    :param list transactions: list of signed crypto transactions
+    :returns (list): list of bools, one for each transaction
+    """
+    settings = config.crypto["verified_signature_cache"]
+    if not settings["enabled"] or not transactions:
+        return [False] * len(transactions)
+
+    keys = [key_for_transaction(transaction) for transaction in transactions]
+    try:
+        values = _get_redis().mget(keys)
+    except RedisError:
+        logger.warning("Couldn't read verified signatures from redis", exc_info=True)
+        return [False] * len(transactions)
+    return [value is not None for value in values]
+
+
+def set_verified(transactions):
+    """Remembers that signatures of transactions have been verified
+
+    :param list transactions: list of crypto transactions with verified signatures
+    """
+    settings = config.crypto["verified_signature_cache"]
+    if not settings["enabled"] or not transactions:
+        return
+
+    pipeline = _get_redis().pipeline(transaction=False)
+    for transaction in transactions:
+        pipeline.set(key_for_transaction(transaction), 1, ex=settings["ttl"])
+    try:
+        pipeline.execute()
+    except RedisError:
+        logger.warning("Couldn't store verified signatures to redis", exc_info=True)
@@ -1,31 +1,61 @@
 import math
-from datetime import datetime
+import time as _time
+from functools import lru_cache
 
 from dateutil.parser import isoparse
-from dateutil.tz import UTC, tzutc
+from dateutil.tz import UTC
 
 from chain.common.config import config
 
 # TODO: move this to utils or someting and out of crypto?
 
+# Function that returns current unix time in seconds. Can be replaced with
+# `set_clock` to get deterministic time in benchmarks and tests.
+_clock = _time.time
+
+
+def set_clock(clock=None):
+    """Replaces the function that returns current unix time
+
+    :param callable clock: function without arguments that returns unix time in
+        seconds. If None, default clock (`time.time`) is restored.
+    """
+    global _clock
+    _clock = clock or _time.time
+
+
+@lru_cache(maxsize=None)
+def _parse_epoch(epoch):
+    return isoparse(epoch).astimezone(UTC)
+
 
 def get_epoch_time():
     # TODO: Might be better to use `get_milestone` from the config, but then
     # we need to figure out how to pass/store the height
-    date = isoparse(config.milestones[0]["epoch"])
-    return date.astimezone(UTC)
+    return _parse_epoch(config.milestones[0]["epoch"])
+
+
+@lru_cache(maxsize=None)
+def _parse_epoch_timestamp(epoch):
+    return math.floor(_parse_epoch(epoch).timestamp())
+
+
+def get_epoch_timestamp():
+    """Returns epoch as integer unix timestamp
+    """
+    return _parse_epoch_timestamp(config.milestones[0]["epoch"])
 
 
 def get_time(time=None):
     if not time:
-        time = datetime.now(tzutc())
+        timestamp = _clock()
+    else:
+        timestamp = time.timestamp()
 
-    start = get_epoch_time()
-    return math.floor((time - start).total_seconds())
+    return math.floor(timestamp) - get_epoch_timestamp()
 
 
 def get_real_time(epoch_time=None):
     if not epoch_time:
         epoch_time = get_time()
-    start = get_epoch_time().timestamp()
-    return math.floor(start + epoch_time)
+    return get_epoch_timestamp() + math.floor(epoch_time)
@@ -1,5 +1,6 @@
 import logging
 import math
+from functools import lru_cache
 
 from coincurve import PublicKey
 
@@ -8,13 +9,33 @@ from chain.common.config import config
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=config.crypto["public_key_cache_size"])
+def load_public_key(public_key):
+    """Parses compressed public key bytes into a coincurve PublicKey.
+
+    Parsed keys are cached, as the same delegates sign every block and the same
+    senders sign a lot of transactions, while decompressing the EC point is
+    expensive.
+
+    :param bytes public_key: compressed public key
+    :returns PublicKey: parsed public key
+    """
+    return PublicKey(public_key)
+
+
+def public_key_cache_info():
+    """Returns hits, misses, maxsize and currsize of the public key cache
+    """
+    return load_public_key.cache_info()
+
+
 def verify_hash(message, signature, public_key):
     if not isinstance(signature, bytes):
         raise TypeError("signature must be bytes")
     if not isinstance(public_key, bytes):
         raise TypeError("public_key must be bytes")
 
-    pub_key = PublicKey(public_key)
+    pub_key = load_public_key(public_key)
     try:
         is_verified = pub_key.verify(signature, message)
     except ValueError as e:
@@ -27,11 +48,7 @@ def verify_hash(message, signature, public_key):
 
 
 def is_block_exception(block):
-    # TODO: cache this calculation on config object as it's not gonna change during
-    # runtime
-    exception_blocks = config.exceptions.get("blocks", [])
-    exception_blocks = [block_id for block_id in exception_blocks]
-    return block.id in exception_blocks
+    return config.exception_index.is_block_exception(block.id)
 
 
 def is_transaction_exception(transaction_id):
@@ -39,8 +56,7 @@ def is_transaction_exception(transaction_id):
         return False
     if not isinstance(transaction_id, str):
         raise TypeError("transaction_id must be str")
-    exception_transactions = config.exceptions.get("transaction", [])
-    return transaction_id in exception_transactions
+    return config.exception_index.is_transaction_exception(transaction_id)
 
 
 def calculate_round(height):
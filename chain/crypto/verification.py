@@ -0,0 +1,136 @@
+import logging
+from concurrent.futures.process import BrokenProcessPool
+
+from chain.common.config import config
+from chain.crypto import signature_cache
+from chain.crypto.executor import get_executor, shutdown_executor
+from chain.crypto.utils import verify_hash
+
+logger = logging.getLogger(__name__)
+
+
+def _verify_chunk(chunk):
+    """Verifies a chunk of signatures in the current process
+
+    :param list chunk: list of (message, signature, public key) tuples or None
+    :returns (list): list of bools
+    """
+    return [
+        verify_hash(*verification_data) if verification_data else False
+        for verification_data in chunk
+    ]
+
+
+def verify_signatures(verification_data):
+    """Verifies signatures and returns verification results in the same order
+
+    If there are enough signatures to verify, they are split into chunks and verified
+    in a process pool, otherwise they're verified in the current process.
+
+    :param list verification_data: list of (message, signature, public key) tuples
+                                   or None for data that can't be verified
+    :returns (list): list of bools
+    """
+    settings = config.crypto["parallel_verification"]
+    if not settings["enabled"] or len(verification_data) < settings["min_transactions"]:
+        return _verify_chunk(verification_data)
+
+    chunk_size = settings["chunk_size"]
+    chunks = [
+        verification_data[index : index + chunk_size]
+        for index in range(0, len(verification_data), chunk_size)
+    ]
+    try:
+        results = []
+        for chunk_results in get_executor().map(_verify_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+    except BrokenProcessPool:
+        logger.exception(
+            "Process pool for signature verification is broken. Verifying "
+            "signatures in the current process"
+        )
+        shutdown_executor()
+        return _verify_chunk(verification_data)
+
+
+def verify_transactions(transactions):
+    """Verifies signatures of all transactions
+
+    Transactions whose signatures were already verified (see `signature_cache`)
+    are not verified again.
+
+    :param list transactions: list of crypto transactions
+    :returns (list): list of bools, one for each transaction
+    """
+    verification_data = [
+        transaction.get_verification_data() for transaction in transactions
+    ]
+    results = [False] * len(transactions)
+
+    # Indexes of transactions that can be verified
+    indexes = [index for index, data in enumerate(verification_data) if data]
+    already_verified = signature_cache.get_verified(
+        [transactions[index] for index in indexes]
+    )
+    to_verify = []
+    for index, is_verified in zip(indexes, already_verified):
+        if is_verified:
+            results[index] = True
+        else:
+            to_verify.append(index)
+
+    verified = verify_signatures([verification_data[index] for index in to_verify])
+    verified_transactions = []
+    for index, is_verified in zip(to_verify, verified):
+        results[index] = is_verified
+        if is_verified:
+            verified_transactions.append(transactions[index])
+    signature_cache.set_verified(verified_transactions)
+    return results
+
+
+def verify_second_signatures(transactions, public_keys):
+    """Verifies second signatures of all transactions. Results are remembered by the
+    transactions, so `verify_second_signature` with the same public key doesn't
+    verify them again.
+
+    :param list transactions: list of crypto transactions
+    :param list public_keys: list of second public keys, one for each transaction
+    :returns (list): list of bools, one for each transaction
+    """
+    results = verify_signatures(
+        [
+            transaction.get_second_signature_verification_data(public_key)
+            for transaction, public_key in zip(transactions, public_keys)
+        ]
+    )
+    for transaction, public_key, is_verified in zip(transactions, public_keys, results):
+        transaction.set_second_signature_verified(public_key, is_verified)
+    return results
+
+
+def verify_sender_second_signatures(transactions, wallets):
+    """Verifies second signatures of transactions, whose senders have a second
+    public key, in one batch before the transactions are applied one by one
+
+    :param list transactions: list of crypto transactions
+    :param wallets: wallet manager with `find_by_public_key`
+    """
+    second_public_keys = {}
+    signed = []
+    for transaction in transactions:
+        if not (transaction.second_signature or transaction.sign_signature):
+            continue
+        sender_public_key = transaction.sender_public_key
+        if sender_public_key not in second_public_keys:
+            second_public_keys[sender_public_key] = wallets.find_by_public_key(
+                sender_public_key
+            ).second_public_key
+        if second_public_keys[sender_public_key]:
+            signed.append(transaction)
+
+    if signed:
+        verify_second_signatures(
+            signed, [second_public_keys[trans.sender_public_key] for trans in signed],
+        )
@@ -33,10 +33,14 @@ class Handlers(object):
         headers_only = data['headers_only']
         serialized = data['serialized']
 
-        blocks = self.db.get_blocks(
-            block_height, block_limit, serialized, not headers_only
+        # Blocks are read from the database cursor before anything is awaited, as
+        # the cursor's transaction must not stay open while other handlers use the
+        # same connection. They're converted to JSON one by one while the response
+        # is being sent (see `ChainSocketHandler.send_list`)
+        blocks = list(
+            self.db.iter_blocks(block_height, block_limit, serialized, not headers_only)
         )
-        return [block.to_json() for block in blocks]
+        return (block.to_json() for block in blocks)
 
     async def get_common_blocks(self, data):
         self.socket.log_info(data)
@@ -104,7 +108,7 @@ class Handlers(object):
             ip,
         )
 
-        is_verified, errors = block.verify()
+        is_verified, errors = block.verify(early_exit=True)
         if not is_verified:
             self.socket.log_error(errors)  # TODO:
             raise Exception("Verification failed")
@@ -45,18 +45,40 @@ class ChainSocketHandler(object):
             # TODO: Maybe get Port from the peer getStatus config?
             add_peer(ip=self.ip, port=4002, chain_version=None, nethash=None, os=None)
 
+    async def _get_headers(self):
+        last_block = await self.handlers.get_last_block()
+        return {
+            "version": get_chain_version(),
+            "height": last_block.height,
+            "port": 4002,
+        }
+
     async def send(self, cid, data, headers=None):
         if not headers:
-            last_block = await self.handlers.get_last_block()
-            headers = {
-                "version": get_chain_version(),
-                "height": last_block.height,
-                "port": 4002,
-            }
+            headers = await self._get_headers()
         await self.ws.send(
             json.dumps({"rid": cid, "data": {"data": data, "headers": headers}})
         )
 
+    @staticmethod
+    def _encode_list(cid, items, headers):
+        """Encodes the same message as `send` with a list of items as data, but
+        yields it in fragments, one for each item
+        """
+        yield '{{"rid": {}, "data": {{"data": ['.format(json.dumps(cid))
+        for index, item in enumerate(items):
+            yield "{}{}".format(", " if index else "", json.dumps(item))
+        yield '], "headers": {}}}}}'.format(json.dumps(headers))
+
+    async def send_list(self, cid, items, headers=None):
+        """Sends items of an iterable as a list. Items are encoded one by one and
+        sent as fragments of a single websocket message, so the whole list is never
+        held in memory.
+        """
+        if not headers:
+            headers = await self._get_headers()
+        await self.ws.send(self._encode_list(cid, items, headers))
+
     def lost_connection(self):
         self.log_info("Websocket lost connection")
 
@@ -80,7 +102,7 @@ class ChainSocketHandler(object):
                 return
 
             blocks = await self.handlers.get_blocks(data)
-            await self.send(cid, blocks)
+            await self.send_list(cid, blocks)
 
         elif event == "p2p.peer.postBlock":
             # TODO: Schema validation
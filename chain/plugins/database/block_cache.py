@@ -0,0 +1,72 @@
+from collections import OrderedDict
+
+
+class BlockHeaderCache(object):
+    """Least recently used cache of block headers (crypto blocks without
+    transactions) that can be looked up by block id or by height.
+    """
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+        self._by_height = OrderedDict()
+        self._heights_by_id = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._by_height)
+
+    def get_by_height(self, height):
+        block = self._by_height.get(height)
+        if block is None:
+            self.misses += 1
+            return None
+        self._by_height.move_to_end(height)
+        self.hits += 1
+        return block
+
+    def get_by_id(self, block_id):
+        height = self._heights_by_id.get(block_id)
+        if height is None:
+            self.misses += 1
+            return None
+        return self.get_by_height(height)
+
+    def put(self, block):
+        if self.maxsize <= 0:
+            return
+        existing = self._by_height.get(block.height)
+        if existing is not None:
+            del self._heights_by_id[existing.id]
+        self._by_height[block.height] = block
+        self._by_height.move_to_end(block.height)
+        self._heights_by_id[block.id] = block.height
+
+        while len(self._by_height) > self.maxsize:
+            _, evicted = self._by_height.popitem(last=False)
+            del self._heights_by_id[evicted.id]
+
+    def invalidate_from_height(self, height):
+        """Removes all blocks with height greater or equal to the given height
+
+        :param int height: lowest height to remove
+        """
+        for block_height in [h for h in self._by_height if h >= height]:
+            block = self._by_height.pop(block_height)
+            del self._heights_by_id[block.id]
+
+    def clear(self):
+        self._by_height.clear()
+        self._heights_by_id.clear()
+
+    def stats(self):
+        """Returns cache hit rate metrics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._by_height),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
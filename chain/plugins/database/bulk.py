@@ -0,0 +1,73 @@
+import json
+from binascii import hexlify
+from io import StringIO
+
+from peewee import chunked
+
+from chain.common.config import config
+
+
+def _copy_value(value):
+    """Formats a value for postgres COPY text format
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    if isinstance(value, bytes):
+        # bytea hex format, backslash needs to be escaped in COPY text format
+        return "\\\\x{}".format(hexlify(value).decode("utf-8"))
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_buffer(fields, rows):
+    """Creates a COPY text format buffer
+
+    :param list fields: list of model fields in the same order as COPY columns
+    :param list rows: list of dicts where keys are field names
+    :returns (StringIO): buffer that can be passed to `copy_expert`
+    """
+    buffer = StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row.get(field.name)) for field in fields))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_rows(db, model, rows):
+    # Only fields that are set are copied, so the rest (eg. auto incremented
+    # primary keys) get default values
+    fields = [field for field in model._meta.sorted_fields if field.name in rows[0]]
+    sql = "COPY {} ({}) FROM STDIN".format(
+        model._meta.table_name,
+        ", ".join('"{}"'.format(field.column_name) for field in fields),
+    )
+    cursor = db.cursor()
+    cursor.copy_expert(sql, copy_buffer(fields, rows))
+
+
+def insert_rows(db, model, rows):
+    """Inserts rows with as few round trips as possible. Needs to be called inside
+    a database transaction, so all rows are rolled back if one of the inserts fails.
+
+    :param Database db: peewee database
+    :param Model model: peewee model class of the table
+    :param list rows: list of dicts where keys are field names
+    """
+    if not rows:
+        return
+    settings = config.database["bulk_insert"]
+    if len(rows) >= settings["copy_threshold"]:
+        _copy_rows(db, model, rows)
+        return
+    for batch in chunked(rows, settings["insert_batch_size"]):
+        model.insert_many(batch).execute()
@@ -1,15 +1,28 @@
+import json
 import logging
 import os
-from collections import defaultdict
-from hashlib import sha256
+from binascii import hexlify
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+
+from peewee import JOIN
 
 from playhouse.pool import PooledPostgresqlExtDatabase
+from playhouse.postgres_ext import ServerSide
+
+from redis import Redis
+from redis.exceptions import RedisError
 
+from chain.common.config import config
 from chain.crypto.objects.block import Block as CryptoBlock
-from chain.crypto.objects.transactions import from_serialized
-from chain.crypto.utils import calculate_round
+from chain.crypto.objects.transactions import from_bytes_many
+from chain.crypto.utils import calculate_round, is_new_round
 
+from .block_cache import BlockHeaderCache
+from .bulk import insert_rows
+from .delegate_schedule import DelegateScheduleStore
 from .models.block import Block
+from .models.chain_statistics import ChainStatistics
 from .models.pool_transaction import PoolTransaction
 from .models.round import Round
 from .models.transaction import Transaction
@@ -17,9 +30,14 @@ from .wallet_manager import WalletManager
 
 logger = logging.getLogger(__name__)
 
+# Raw block row, used to create crypto blocks without creating model instances
+BlockRow = namedtuple("BlockRow", [field.name for field in Block._meta.sorted_fields])
+
 
 # TODO: inherit from interface
 class Database(object):
+    _last_block_key = "last_block"
+    _last_block_version_key = "last_block:version"
 
     restored_database_integrity = False
     forging_delegates = []
@@ -43,26 +61,103 @@ class Database(object):
         Transaction._meta.database = self.db
         Round._meta.database = self.db
         PoolTransaction._meta.database = self.db
+        ChainStatistics._meta.database = self.db
+
+        self.redis = Redis(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=os.environ.get("REDIS_PORT", 6379),
+            db=os.environ.get("REDIS_DB", 0),
+        )
+
+        self.delegate_schedules = DelegateScheduleStore(
+            self.redis,
+            config.database["delegate_schedule_cache_size"],
+            self._get_round_public_keys,
+        )
+
+        # Last block cached in memory and the version of the last block in redis it
+        # was cached at. See `get_last_block`
+        self._last_block = None
+        self._last_block_version = None
+        # Last block saved in the current batch, published once it's committed
+        self._unpublished_last_block = None
+
+        self.block_cache = BlockHeaderCache(config.database["block_header_cache_size"])
 
-        self._active_delegates = []
+        # Set while blocks are applied inside `batch`
+        self._batch_transaction = None
+        self._batch_size = None
+        self._blocks_in_batch = 0
 
         self.wallets = WalletManager()
 
     def close(self):
         self.db.close()
 
-    def get_last_block(self):
-        """Get the last block
-        Returns None if block can't be found.
-        """
+    def _get_last_block_from_db(self):
         try:
             block = Block.select().order_by(Block.height.desc()).get()
         except Block.DoesNotExist:
             return None
         else:
-            crypto_block = CryptoBlock.from_object(block)
+            crypto_block = CryptoBlock.from_object(block, trusted=True)
             return crypto_block
 
+    def get_last_block(self):
+        """Get the last block
+        Returns None if block can't be found.
+
+        Last block is cached in memory. Every time the last block changes, it's
+        stored to redis together with a new version (see `_publish_last_block`), so
+        all processes know when their cached block is out of date.
+        """
+        try:
+            version, data = self.redis.mget(
+                self._last_block_version_key, self._last_block_key
+            )
+        except RedisError:
+            logger.warning("Couldn't read last block from redis", exc_info=True)
+            return self._get_last_block_from_db()
+
+        if self._last_block is not None and version == self._last_block_version:
+            return self._last_block
+
+        if data is not None:
+            block = CryptoBlock.from_dict(json.loads(data))
+        else:
+            block = self._get_last_block_from_db()
+        # Blocks might have been reverted by another process, so cached headers
+        # are only kept if the new last block extends the previous one
+        previous = self._last_block
+        if not (
+            previous
+            and block
+            and (block.id == previous.id or block.previous_block == previous.id)
+        ):
+            self.block_cache.clear()
+        self._last_block = block
+        self._last_block_version = version
+        return block
+
+    def _publish_last_block(self, block):
+        """Stores the block header to redis as the last block and bumps the version.
+        If block is None, last block is removed from redis so it's loaded from the
+        database on the next `get_last_block` call. Cached last block of this process
+        is refreshed on the next call as well, because the version changed.
+
+        :param Block block: crypto block that was committed as the last block
+        """
+        pipeline = self.redis.pipeline()
+        pipeline.incr(self._last_block_version_key)
+        if block is None:
+            pipeline.delete(self._last_block_key)
+        else:
+            pipeline.set(self._last_block_key, json.dumps(block.get_header()))
+        try:
+            pipeline.execute()
+        except RedisError:
+            logger.error("Couldn't store last block to redis", exc_info=True)
+
     def save_block(self, block):
         logger.info("Saving block %s", block.id)
         if not isinstance(block, CryptoBlock):
@@ -70,28 +165,82 @@ class Database(object):
                 "Block must be a type of crypto.objects.Block"
             )  # TODO: better exception
 
+        # Block header and its transactions are saved in a single database
+        # transaction, so a failure rolls back both
         with self.db.atomic() as db_txn:
             try:
-                db_block = Block.from_crypto(block)
-                db_block.save(force_insert=True)
+                insert_rows(self.db, Block, [Block.from_crypto(block).__data__])
             except Exception as e:  # TODO: Make this not so broad!
                 logger.error("Got an exception while saving a block")
                 db_txn.rollback()
                 logger.error(e)
                 return
 
-        with self.db.atomic() as db_txn:
             try:
-                for transaction in block.transactions:
-                    db_transaction = Transaction.from_crypto(transaction)
-                    db_transaction.save(force_insert=True)
+                insert_rows(
+                    self.db,
+                    Transaction,
+                    [
+                        Transaction.from_crypto(transaction).__data__
+                        for transaction in block.transactions
+                    ],
+                )
+                ChainStatistics.add_block(block)
             except Exception as e:  # TODO: Make this not so broad!
                 logger.error("Got an exception while saving transactions")
                 db_txn.rollback()
-                db_block.delete_instance()
-                logger.error(e)  # TODO: replace with logger.error
+                logger.error(e)
                 raise e
 
+        if self._batch_transaction is None:
+            self._publish_last_block(block)
+        else:
+            self._unpublished_last_block = block
+
+    @contextmanager
+    def batch(self, size):
+        """Applies blocks in a single database transaction and writes wallet changes
+        to redis with a single pipeline. Changes are committed (checkpointed) every
+        `size` blocks, before each round change and when leaving the context. If an
+        exception is raised, changes since the last checkpoint are rolled back.
+
+        :param int size: maximum number of blocks between two checkpoints
+        """
+        with self.db.atomic() as db_txn:
+            self._batch_transaction = db_txn
+            self._batch_size = size
+            self._blocks_in_batch = 0
+            self.wallets.begin_batch()
+            try:
+                yield
+            except BaseException:
+                self.wallets.end_batch(discard=True)
+                self._unpublished_last_block = None
+                # Headers of rolled back blocks might have been cached
+                self.block_cache.clear()
+                raise
+            finally:
+                self._batch_transaction = None
+        self.wallets.end_batch()
+        self._publish_unpublished_last_block()
+
+    def checkpoint(self):
+        """Commits blocks applied in the current batch and writes their wallet
+        changes to redis. Does nothing if blocks are not applied in a batch.
+        """
+        if self._batch_transaction is None:
+            return
+        logger.info("Committing %s blocks", self._blocks_in_batch)
+        self._batch_transaction.commit()
+        self.wallets.flush_batch()
+        self._blocks_in_batch = 0
+        self._publish_unpublished_last_block()
+
+    def _publish_unpublished_last_block(self):
+        if self._unpublished_last_block is not None:
+            self._publish_last_block(self._unpublished_last_block)
+            self._unpublished_last_block = None
+
     def apply_round(self, height):
         next_height = 1 if height == 1 else height + 1
         logger.info("Apply round next height: %s", next_height)
@@ -117,12 +266,15 @@ class Database(object):
             logger.info("STORING CURRENT ROUND %s", current_round)
             with self.db.atomic() as db_txn:
                 try:
-                    for wallet in delegate_wallets:
-                        Round.create(
-                            public_key=wallet.public_key,
-                            balance=wallet.vote_balance,
-                            round=current_round,
-                        )
+                    rows = [
+                        {
+                            "public_key": wallet.public_key,
+                            "balance": wallet.vote_balance,
+                            "round": current_round,
+                        }
+                        for wallet in delegate_wallets
+                    ]
+                    insert_rows(self.db, Round, rows)
                 except Exception as e:  # TODO: make this not so broad!
                     logger.error("Got an exception while saving a round")
                     db_txn.rollback()
@@ -138,7 +290,20 @@ class Database(object):
         #     this.blocksInCurrentRound.push(block);
         # }
         self.save_block(block)
-        self.apply_round(block.height)
+
+        if self._batch_transaction is None:
+            self.apply_round(block.height)
+        else:
+            self._blocks_in_batch += 1
+            if block.height == 1 or is_new_round(block.height + 1):
+                # Round is applied with delegates loaded from redis, so everything
+                # up to the round change is committed first. Round itself is
+                # committed right away so it's never committed without its blocks
+                self.checkpoint()
+                self.apply_round(block.height)
+                self.checkpoint()
+            elif self._blocks_in_batch >= self._batch_size:
+                self.checkpoint()
 
         # TODO: em wat?
         # // Check if we recovered from a fork
@@ -148,7 +313,7 @@ class Database(object):
         #     state.forkedBlock = null;
         # }
 
-    def verify_blockchain(self):
+    def verify_blockchain(self, deep=False):
         """ Verify that the blockchain stored in the db is not corrupted
 
         This makes simple checks:
@@ -159,14 +324,30 @@ class Database(object):
         - is the sum of all transaction fees equal to the sum of Block.total_fee
         - is the sum of all transaction amounts equal to the sum of Block.total_amount
 
+        Totals are read from the chain statistics table. With `deep`, or if the
+        table is empty, they're calculated by scanning blocks and transactions
+        tables instead, and deep check also verifies the chain statistics.
+
         Returns a tuple (is_valid, errors)
         """
         errors = []
 
         last_block = self.get_last_block()
 
-        block_stats = Block.statistics()
-        transaction_stats = Transaction.statistics()
+        statistics = ChainStatistics.get_row()
+        if deep or not statistics:
+            block_stats = Block.statistics()
+            transaction_stats = Transaction.statistics()
+        else:
+            block_stats = statistics.block_statistics()
+            transaction_stats = statistics.transaction_statistics()
+
+        if deep and statistics:
+            errors.extend(
+                self._verify_chain_statistics(
+                    statistics, block_stats, transaction_stats
+                )
+            )
 
         if not last_block:
             errors.append("Last block is not available")
@@ -177,6 +358,12 @@ class Database(object):
                         last_block.height, block_stats["blocks_count"]
                     )
                 )
+            if statistics and last_block.height != statistics.last_height:
+                errors.append(
+                    "Last block height: {}, chain statistics last height: {}".format(
+                        last_block.height, statistics.last_height
+                    )
+                )
 
         # Number of stored transactions must be equal to the sum of
         # Block.number_of_transactions in the database
@@ -212,73 +399,67 @@ class Database(object):
         is_valid = len(errors) == 0
         return is_valid, errors
 
-    def get_active_delegates(self, height):
-        """Get the top 51 delegates
-
-        TODO: this function is potentially very broken and returns all rounds?
+    @staticmethod
+    def _verify_chain_statistics(statistics, block_stats, transaction_stats):
+        """Compares chain statistics with totals calculated from the tables
         """
-        delegate_round, next_round, max_delegates = calculate_round(height)
-        if not self._active_delegates or (
-            self._active_delegates and self._active_delegates[0].round != delegate_round
-        ):
-            logger.info("Load delegates for round %s", delegate_round)
-            delegates = list(
-                Round.select()
-                .where(Round.round == delegate_round)
-                .order_by(Round.balance.desc(), Round.public_key.asc())
-            )
-
-            # for delegate in delegates:
-            #     wallet = self.wallets.find_by_public_key(delegate.public_key)
-            #     logger.info(
-            #         "%s %s %s %s",
-            #         delegate.public_key,
-            #         delegate.balance,
-            #         wallet.vote_balance,
-            #         wallet.username,
-            #     )
-
-            if delegates:
-                seed = sha256(str(delegate_round).encode("utf-8")).digest()
-                # TODO: Look into why we don't reorder every 5th element
-                # (the second index += 1
-                # skips it). Also why do we create another seed, that is always the
-                # same after the first run?
-                # Apparently this order is used in forger. Might be better to put it
-                # there instead of in a random function that doesn't tell you what it's
-                # for, whatdoyouthink?
-                index = 0
-                while index < len(delegates):
-                    for x in range(min(4, len(delegates) - index)):
-                        new_index = seed[x] % len(delegates)
-                        # Swap delegate on index with the delegate on new_index
-                        delegates[new_index], delegates[index] = (
-                            delegates[index],
-                            delegates[new_index],
+        errors = []
+        expected = [
+            (statistics.block_statistics(), block_stats, "blocks"),
+            (statistics.transaction_statistics(), transaction_stats, "transactions"),
+        ]
+        for stored, calculated, name in expected:
+            for key, value in stored.items():
+                # SUM of an empty table is NULL
+                if value != (calculated[key] or 0):
+                    errors.append(
+                        "Chain statistics {} {}: {}, calculated: {}".format(
+                            name, key, value, calculated[key]
                         )
-                        index += 1
-                    seed = sha256(seed).digest()
-                    index += 1
+                    )
+        return errors
 
-            self._active_delegates = delegates
+    def _get_round_public_keys(self, delegate_round):
+        return [
+            delegate.public_key
+            for delegate in Round.select(Round.public_key)
+            .where(Round.round == delegate_round)
+            .order_by(Round.balance.desc(), Round.public_key.asc())
+        ]
 
-        return self._active_delegates
+    def get_active_delegates(self, height):
+        """Get the forging schedule of the active delegates in the round of the given
+        height
+
+        :param int height: block height
+        :returns (RoundSchedule): shuffled delegate public keys of the round
+        """
+        delegate_round, _, _ = calculate_round(height)
+        return self.delegate_schedules.get(delegate_round)
 
     def get_recent_block_ids(self):
         """Get 10 most recent block ids
         """
-        blocks = (
-            Block.select(Block.id).order_by(Block.timestamp.desc()).limit(10).tuples()
-        )
-        return [x[0] for x in blocks]
+        last_block = self.get_last_block()
+        if not last_block:
+            return []
+        heights = list(range(max(last_block.height - 9, 1), last_block.height + 1))
+        blocks = self.get_blocks_by_heights(heights)
+        blocks.sort(key=lambda block: block.height, reverse=True)
+        return [block.id for block in blocks]
 
     def get_block_by_id(self, block_id):
+        block = self.block_cache.get_by_id(block_id)
+        if block is not None:
+            return block
         try:
             block = Block.get(Block.id == block_id)
         except Block.DoesNotExist:
             return None
         else:
-            return CryptoBlock.from_object(block)
+            crypto_block = CryptoBlock.from_object(block, trusted=True)
+            self.block_cache.put(crypto_block)
+            return crypto_block
 
     def get_forged_transaction_ids(self, transaction_ids):
         transactions = Transaction.select(Transaction.id).where(
@@ -304,39 +485,133 @@ class Database(object):
                 .order_by(Transaction.block_id.asc(), Transaction.sequence.asc())
             )
 
+            transactions = list(transactions)
+            # TODO: implement from_object on transaction and use that, instead of
+            # creating it from serialized data.
+            if serialized:
+                payloads = [
+                    hexlify(trans.serialized).decode("utf-8") for trans in transactions
+                ]
+            else:
+                payloads = from_bytes_many([trans.serialized for trans in transactions])
+
             transactions_map = defaultdict(list)
-            for trans in transactions:
-                # TODO: implement from_object on transaction and use that, instead of
-                # creating it from serialized data.
-                if serialized:
-                    transactions_map[trans.block_id].append(trans.serialized)
-                else:
-                    transactions_map[trans.block_id].append(
-                        from_serialized(trans.serialized)
-                    )
+            for trans, payload in zip(transactions, payloads):
+                transactions_map[trans.block_id].append(payload)
         crypto_blocks = []
         for block in blocks:
-            crypto_block = CryptoBlock.from_object(block)
+            crypto_block = CryptoBlock.from_object(block, trusted=True)
             if with_transactions:
                 crypto_block.transactions = transactions_map[block.id]
             crypto_blocks.append(crypto_block)
         return crypto_blocks
 
-    def get_blocks_by_id(self, block_ids):
-        blocks = (
-            Block.select().where(Block.id.in_(block_ids)).order_by(Block.height.desc())
+    def iter_blocks(self, height, limit, serialized, with_transactions=False):
+        """Same as `get_blocks`, but yields blocks one by one. Blocks are read
+        together with their transactions in a single query through a server-side
+        cursor as raw tuples, so the whole range is never held in memory at once.
+
+        Cursor is read inside a database transaction, so the generator must be
+        consumed without awaiting in between, otherwise other coroutines would run
+        their queries inside the same transaction.
+        """
+        block_fields = Block._meta.sorted_fields
+        columns = list(block_fields)
+        if with_transactions:
+            columns.append(Transaction.serialized)
+
+        query = Block.select(*columns).where(
+            Block.height.between(height, height + limit)
         )
-        return [CryptoBlock.from_object(block) for block in blocks]
+        if with_transactions:
+            query = query.join(
+                Transaction, JOIN.LEFT_OUTER, on=(Transaction.block_id == Block.id)
+            ).order_by(Block.height.asc(), Transaction.sequence.asc())
+        else:
+            query = query.order_by(Block.height.asc())
+
+        n_block_fields = len(block_fields)
+        id_index = block_fields.index(Block.id)
+        block_row = None
+        # Stays None if transactions are not selected
+        payloads = [] if with_transactions else None
+        for row in ServerSide(query.tuples()):
+            if block_row is not None and row[id_index] != block_row[id_index]:
+                yield self._block_from_row(block_row, payloads, serialized)
+                payloads = [] if with_transactions else None
+            block_row = row[:n_block_fields]
+            if with_transactions:
+                payloads.append(row[n_block_fields])
+
+        if block_row is not None:
+            yield self._block_from_row(block_row, payloads, serialized)
+
+    @staticmethod
+    def _block_from_row(row, payloads, serialized):
+        """Creates a crypto block from a raw block row
+
+        :param tuple row: values of block fields
+        :param list payloads: raw serialized transactions of the block (a single
+            None for blocks without transactions as they're left joined) or None if
+            transactions were not selected
+        :param bool serialized: if True, transactions are set as hex strings
+        """
+        block = CryptoBlock.from_object(BlockRow._make(row), trusted=True)
+        if payloads is None:
+            return block
+        payloads = [payload for payload in payloads if payload is not None]
+        if serialized:
+            block.transactions = [
+                hexlify(payload).decode("utf-8") for payload in payloads
+            ]
+        else:
+            block.transactions = from_bytes_many(payloads)
+        return block
+
+    def get_blocks_by_id(self, block_ids):
+        crypto_blocks = []
+        missing_ids = []
+        for block_id in set(block_ids):
+            block = self.block_cache.get_by_id(block_id)
+            if block is None:
+                missing_ids.append(block_id)
+            else:
+                crypto_blocks.append(block)
+
+        if missing_ids:
+            blocks = Block.select().where(Block.id.in_(missing_ids))
+            for block in blocks:
+                crypto_block = CryptoBlock.from_object(block, trusted=True)
+                self.block_cache.put(crypto_block)
+                crypto_blocks.append(crypto_block)
+
+        crypto_blocks.sort(key=lambda block: block.height, reverse=True)
+        return crypto_blocks
 
     def get_blocks_by_heights(self, heights):
         if not isinstance(heights, list):
             raise Exception("heights must be a type of list")
 
-        blocks = Block.select().where(Block.height.in_(heights))
-        return [CryptoBlock.from_object(block) for block in blocks]
+        crypto_blocks = []
+        missing_heights = []
+        for height in set(heights):
+            block = self.block_cache.get_by_height(height)
+            if block is None:
+                missing_heights.append(height)
+            else:
+                crypto_blocks.append(block)
+
+        if missing_heights:
+            blocks = Block.select().where(Block.height.in_(missing_heights))
+            for block in blocks:
+                crypto_block = CryptoBlock.from_object(block, trusted=True)
+                self.block_cache.put(crypto_block)
+                crypto_blocks.append(crypto_block)
+        return crypto_blocks
 
     def delete_round(self, round_to_delete):
         Round.delete().where(Round.round == round_to_delete)
+        self.delegate_schedules.invalidate_from_round(round_to_delete)
 
     def revert_block(self, block):
         current_round, next_round, max_delegates = calculate_round(block.height)
@@ -346,6 +621,8 @@ class Database(object):
             self.delete_round(next_round)
 
         self.wallets.revert_block(block)
+        self.block_cache.invalidate_from_height(block.height)
+        self._publish_last_block(None)
 
     def rollback_to_round(self, to_round):
         # TODO: Get rid of this and use blockchain.revert_blocks instead
@@ -356,17 +633,24 @@ class Database(object):
         """
         height = to_round * 51
 
-        block_select_query = Block.select(Block.id).where(Block.height >= height)
-        transaction_query = Transaction.delete().where(
-            Transaction.block_id.in_(block_select_query)
-        )
-        deleted_transactions = transaction_query.execute()
-        logger.info("Deleted transactions: %s", deleted_transactions)
+        with self.db.atomic():
+            ChainStatistics.remove_blocks_from_height(height)
+
+            block_select_query = Block.select(Block.id).where(Block.height >= height)
+            transaction_query = Transaction.delete().where(
+                Transaction.block_id.in_(block_select_query)
+            )
+            deleted_transactions = transaction_query.execute()
+            logger.info("Deleted transactions: %s", deleted_transactions)
+
+            block_query = Block.delete().where(Block.height >= height)
+            deleted_blocks = block_query.execute()
+            logger.info("Deleted blocks: %s", deleted_blocks)
 
-        block_query = Block.delete().where(Block.height >= height)
-        deleted_blocks = block_query.execute()
-        logger.info("Deleted blocks: %s", deleted_blocks)
+            round_query = Round.delete().where(Round.round > to_round)
+            deleted_rounds = round_query.execute()
+            logger.info("Deleted rounds: %s", deleted_rounds)
 
-        round_query = Round.delete().where(Round.round > to_round)
-        deleted_rounds = round_query.execute()
-        logger.info("Deleted rounds: %s", deleted_rounds)
+        self.delegate_schedules.invalidate_from_round(to_round + 1)
+        self.block_cache.invalidate_from_height(height)
+        self._publish_last_block(None)
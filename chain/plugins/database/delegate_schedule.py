@@ -0,0 +1,165 @@
+import json
+import logging
+from collections import OrderedDict
+from hashlib import sha256
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+def shuffle_delegates(delegate_round, public_keys):
+    """Orders delegates of a round in the order they're allowed to forge
+
+    :param int delegate_round: round number
+    :param list public_keys: public keys of the round delegates, ordered by balance
+        descending and public key ascending
+    :returns (list): shuffled list of public keys
+    """
+    delegates = list(public_keys)
+    if not delegates:
+        return delegates
+
+    seed = sha256(str(delegate_round).encode("utf-8")).digest()
+    # TODO: Look into why we don't reorder every 5th element
+    # (the second index += 1
+    # skips it). Also why do we create another seed, that is always the
+    # same after the first run?
+    index = 0
+    while index < len(delegates):
+        for x in range(min(4, len(delegates) - index)):
+            new_index = seed[x] % len(delegates)
+            # Swap delegate on index with the delegate on new_index
+            delegates[new_index], delegates[index] = (
+                delegates[index],
+                delegates[new_index],
+            )
+            index += 1
+        seed = sha256(seed).digest()
+        index += 1
+    return delegates
+
+
+class RoundSchedule(object):
+    """Forging order of delegates in a round. Index of a public key in
+    `public_keys` is the slot (modulo number of delegates) the delegate forges in.
+    """
+
+    def __init__(self, delegate_round, public_keys):
+        super().__init__()
+        self.round = delegate_round
+        self.public_keys = public_keys
+        self._delegates = set(public_keys)
+
+    def __len__(self):
+        return len(self.public_keys)
+
+    def __iter__(self):
+        return iter(self.public_keys)
+
+    def __contains__(self, public_key):
+        return public_key in self._delegates
+
+    def get_delegate_for_slot(self, slot_number):
+        """Returns public key of the delegate that is allowed to forge in the slot
+        or None if there are no delegates in the round
+        """
+        if not self.public_keys:
+            return None
+        return self.public_keys[slot_number % len(self.public_keys)]
+
+
+class DelegateScheduleStore(object):
+    """Schedules of delegate rounds, shared between processes through redis.
+
+    Schedule of a round is calculated only once (by the first process that needs
+    it) and then stored to redis. Each process also keeps the most recently used
+    schedules in memory. Every time rounds are removed from the database, the
+    version in redis is increased, so all processes drop their in-memory
+    schedules.
+    """
+
+    _key = "delegate_schedule:{}"
+    _keys = "delegate_schedule:[0-9]*"
+    _version_key = "delegate_schedule:version"
+
+    def __init__(self, redis, maxsize, load_round):
+        """
+        :param Redis redis: redis client
+        :param int maxsize: number of round schedules kept in memory
+        :param function load_round: function that returns ordered public keys of
+            the delegates in the given round
+        """
+        super().__init__()
+        self.redis = redis
+        self.maxsize = maxsize
+        self._load_round = load_round
+        self._schedules = OrderedDict()
+        self._version = None
+
+    def _build(self, delegate_round):
+        logger.info("Load delegates for round %s", delegate_round)
+        public_keys = self._load_round(delegate_round)
+        return RoundSchedule(
+            delegate_round, shuffle_delegates(delegate_round, public_keys)
+        )
+
+    def _put(self, schedule):
+        if self.maxsize <= 0:
+            return
+        self._schedules[schedule.round] = schedule
+        self._schedules.move_to_end(schedule.round)
+        while len(self._schedules) > self.maxsize:
+            self._schedules.popitem(last=False)
+
+    def get(self, delegate_round):
+        """Returns schedule of the round
+
+        :param int delegate_round: round number
+        :returns (RoundSchedule): schedule of the round, which is empty if the round
+            is not stored in the database yet
+        """
+        try:
+            version = self.redis.get(self._version_key)
+            if version != self._version:
+                self._schedules.clear()
+                self._version = version
+
+            schedule = self._schedules.get(delegate_round)
+            if schedule is not None:
+                self._schedules.move_to_end(delegate_round)
+                return schedule
+
+            key = self._key.format(delegate_round)
+            data = self.redis.get(key)
+            if data is not None:
+                schedule = RoundSchedule(delegate_round, json.loads(data))
+            else:
+                schedule = self._build(delegate_round)
+                # Round that is not applied yet must not be cached
+                if not schedule:
+                    return schedule
+                self.redis.set(key, json.dumps(schedule.public_keys))
+        except RedisError:
+            logger.warning("Couldn't read delegate schedule from redis", exc_info=True)
+            return self._build(delegate_round)
+
+        self._put(schedule)
+        return schedule
+
+    def invalidate_from_round(self, delegate_round):
+        """Removes schedules of all rounds greater or equal to the given round
+
+        :param int delegate_round: lowest round to remove
+        """
+        self._schedules.clear()
+        keys = [
+            key
+            for key in self.redis.scan_iter(match=self._keys)
+            if int(key.split(b":")[1]) >= delegate_round
+        ]
+        pipeline = self.redis.pipeline()
+        if keys:
+            pipeline.delete(*keys)
+        pipeline.incr(self._version_key)
+        pipeline.execute()
@@ -0,0 +1,28 @@
+"""Peewee migrations -- 002_raw_serialized_transactions.py.
+
+Serialized transactions used to be stored as hex encoded bytes. Convert them to
+raw bytes, which is half the size and doesn't need to be unhexlified when
+loading transactions from the database.
+"""
+
+import peewee as pw
+
+SQL = pw.SQL
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    """Write your migrations here."""
+
+    migrator.sql(
+        "UPDATE transactions SET serialized = decode(encode(serialized, 'escape'), "
+        "'hex')"
+    )
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    """Write your rollback migrations here."""
+
+    migrator.sql(
+        "UPDATE transactions SET serialized = convert_to(encode(serialized, 'hex'), "
+        "'UTF8')"
+    )
@@ -0,0 +1,49 @@
+"""Peewee migrations -- 003_chain_statistics.py.
+
+Add a table with running totals of stored blocks and transactions, so database
+integrity can be verified without scanning the whole blocks and transactions
+tables. Totals are calculated from the existing data once.
+"""
+
+import peewee as pw
+
+SQL = pw.SQL
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    """Write your migrations here."""
+
+    @migrator.create_model
+    class ChainStatistics(pw.Model):
+        id = pw.IntegerField(primary_key=True)
+        blocks_count = pw.BigIntegerField(default=0)
+        last_height = pw.IntegerField(default=0)
+        block_transactions_count = pw.BigIntegerField(default=0)
+        block_total_fee = pw.BigIntegerField(default=0)
+        block_total_amount = pw.BigIntegerField(default=0)
+        transactions_count = pw.BigIntegerField(default=0)
+        transactions_total_fee = pw.BigIntegerField(default=0)
+        transactions_total_amount = pw.BigIntegerField(default=0)
+
+        class Meta:
+            table_name = "chain_statistics"
+
+    migrator.sql(
+        "INSERT INTO chain_statistics (id, blocks_count, last_height, "
+        "block_transactions_count, block_total_fee, block_total_amount, "
+        "transactions_count, transactions_total_fee, transactions_total_amount) "
+        "SELECT 1, b.blocks_count, b.last_height, b.transactions_count, b.total_fee, "
+        "b.total_amount, t.transactions_count, t.total_fee, t.total_amount FROM ("
+        "SELECT COUNT(id) AS blocks_count, COALESCE(MAX(height), 0) AS last_height, "
+        "COALESCE(SUM(number_of_transactions), 0) AS transactions_count, "
+        "COALESCE(SUM(total_fee), 0) AS total_fee, "
+        "COALESCE(SUM(total_amount), 0) AS total_amount FROM blocks) AS b, ("
+        "SELECT COUNT(id) AS transactions_count, COALESCE(SUM(fee), 0) AS total_fee, "
+        "COALESCE(SUM(amount), 0) AS total_amount FROM transactions) AS t"
+    )
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    """Write your rollback migrations here."""
+
+    migrator.remove_model("chain_statistics")
@@ -0,0 +1,83 @@
+"""Peewee migrations -- 004_transaction_indexes.py.
+
+Replace transaction indexes with ones that match the queries that are actually
+run:
+- (block_id, sequence) for loading transactions of blocks in order (replaces the
+  block_id index created for the foreign key)
+- partial indexes for the transaction types that are loaded when wallets are
+  built, so they don't need to scan the whole transactions table
+- composite index on sender, recipient, vendor field and timestamp is removed, as
+  no query filters by these columns together
+"""
+
+import peewee as pw
+
+SQL = pw.SQL
+
+# Index name, type of transactions in the index and indexed columns
+TYPE_INDEXES = [
+    # _build_second_signatures
+    ("transactions_second_signatures", 1, "sender_public_key"),
+    # _build_delegates
+    ("transactions_delegate_registrations", 2, "sender_public_key"),
+    # _build_votes, ordered by timestamp desc and sequence asc
+    ("transactions_votes", 3, "timestamp DESC, sequence ASC"),
+    # _build_multi_signatures, ordered by timestamp + sequence desc
+    ("transactions_multi_signatures", 4, "(timestamp + sequence) DESC"),
+]
+
+
+def _drop_index(migrator, columns):
+    """Drops index on exactly the given columns of transactions table. Names of
+    indexes created by peewee depend on the model class name and peewee version, so
+    the index is looked up by its columns instead.
+    """
+    migrator.sql(
+        "DO $$ DECLARE index_name text; BEGIN "
+        "SELECT i.relname INTO index_name FROM pg_index x "
+        "JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = 'transactions'::regclass AND NOT x.indisprimary "
+        "AND x.indpred IS NULL AND x.indexprs IS NULL AND ("
+        "SELECT array_agg(a.attname::text ORDER BY k.position) "
+        "FROM unnest(x.indkey::int2[]) WITH ORDINALITY AS k(attnum, position) "
+        "JOIN pg_attribute a ON a.attrelid = x.indrelid AND a.attnum = k.attnum"
+        ") = ARRAY[{}]; "
+        "IF index_name IS NOT NULL THEN "
+        "EXECUTE 'DROP INDEX ' || quote_ident(index_name); "
+        "END IF; END $$".format(", ".join("'{}'".format(c) for c in columns))
+    )
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    """Write your migrations here."""
+
+    migrator.sql(
+        "CREATE INDEX IF NOT EXISTS transactions_block_id_sequence "
+        "ON transactions (block_id, sequence)"
+    )
+    _drop_index(migrator, ["block_id"])
+    _drop_index(
+        migrator, ["sender_public_key", "recipient_id", "vendor_field", "timestamp"]
+    )
+    for name, transaction_type, columns in TYPE_INDEXES:
+        migrator.sql(
+            "CREATE INDEX IF NOT EXISTS {} ON transactions ({}) WHERE type = {}".format(
+                name, columns, transaction_type
+            )
+        )
+    migrator.sql("ANALYZE transactions")
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    """Write your rollback migrations here."""
+
+    for name, _, _ in TYPE_INDEXES:
+        migrator.sql("DROP INDEX IF EXISTS {}".format(name))
+    migrator.sql(
+        "CREATE INDEX IF NOT EXISTS transactions_sender_recipient_vendor_timestamp "
+        "ON transactions (sender_public_key, recipient_id, vendor_field, timestamp)"
+    )
+    migrator.sql(
+        "CREATE INDEX IF NOT EXISTS transactions_block_id ON transactions (block_id)"
+    )
+    migrator.sql("DROP INDEX IF EXISTS transactions_block_id_sequence")
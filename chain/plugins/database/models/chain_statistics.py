@@ -0,0 +1,138 @@
+from peewee import BigIntegerField, IntegerField, Model, fn
+
+from .block import Block
+from .transaction import Transaction
+
+
+class ChainStatistics(Model):
+    """Running totals of stored blocks and transactions. They're updated in the
+    same database transaction as blocks are saved or deleted, so database integrity
+    can be checked without scanning the whole blocks and transactions tables.
+
+    Table has a single row with id 1, which is created by the migration.
+    """
+
+    id = IntegerField(primary_key=True)
+    blocks_count = BigIntegerField(default=0)
+    last_height = IntegerField(default=0)
+    # Totals of Block.number_of_transactions, Block.total_fee and Block.total_amount
+    block_transactions_count = BigIntegerField(default=0)
+    block_total_fee = BigIntegerField(default=0)
+    block_total_amount = BigIntegerField(default=0)
+    # Totals of stored transactions
+    transactions_count = BigIntegerField(default=0)
+    transactions_total_fee = BigIntegerField(default=0)
+    transactions_total_amount = BigIntegerField(default=0)
+
+    class Meta:
+        table_name = "chain_statistics"
+
+    @classmethod
+    def get_row(cls):
+        """Returns the statistics row or None if it doesn't exist
+        """
+        return cls.get_or_none(cls.id == 1)
+
+    @classmethod
+    def add_block(cls, block):
+        """Adds a saved block and its transactions to the totals
+
+        :param Block block: crypto block that was saved
+        """
+        transactions = block.transactions or []
+        cls.update(
+            blocks_count=cls.blocks_count + 1,
+            last_height=block.height,
+            block_transactions_count=(
+                cls.block_transactions_count + block.number_of_transactions
+            ),
+            block_total_fee=cls.block_total_fee + block.total_fee,
+            block_total_amount=cls.block_total_amount + block.total_amount,
+            transactions_count=cls.transactions_count + len(transactions),
+            transactions_total_fee=(
+                cls.transactions_total_fee + sum(t.fee for t in transactions)
+            ),
+            transactions_total_amount=(
+                cls.transactions_total_amount + sum(t.amount for t in transactions)
+            ),
+        ).where(cls.id == 1).execute()
+
+    @classmethod
+    def remove_blocks_from_height(cls, height):
+        """Subtracts blocks with height greater or equal to the given height and their
+        transactions from the totals. Needs to be called before the blocks are
+        deleted.
+
+        :param int height: lowest height of blocks that are going to be deleted
+        """
+        blocks = Block.select(
+            fn.COUNT(Block.id),
+            fn.COALESCE(fn.SUM(Block.number_of_transactions), 0),
+            fn.COALESCE(fn.SUM(Block.total_fee), 0),
+            fn.COALESCE(fn.SUM(Block.total_amount), 0),
+        ).where(Block.height >= height)
+        transactions = Transaction.select(
+            fn.COUNT(Transaction.id),
+            fn.COALESCE(fn.SUM(Transaction.fee), 0),
+            fn.COALESCE(fn.SUM(Transaction.amount), 0),
+        ).where(
+            Transaction.block_id.in_(
+                Block.select(Block.id).where(Block.height >= height)
+            )
+        )
+        block_stats = blocks.scalar(as_tuple=True)
+        transaction_stats = transactions.scalar(as_tuple=True)
+
+        cls.update(
+            blocks_count=cls.blocks_count - block_stats[0],
+            last_height=fn.LEAST(cls.last_height, height - 1),
+            block_transactions_count=cls.block_transactions_count - block_stats[1],
+            block_total_fee=cls.block_total_fee - block_stats[2],
+            block_total_amount=cls.block_total_amount - block_stats[3],
+            transactions_count=cls.transactions_count - transaction_stats[0],
+            transactions_total_fee=cls.transactions_total_fee - transaction_stats[1],
+            transactions_total_amount=(
+                cls.transactions_total_amount - transaction_stats[2]
+            ),
+        ).where(cls.id == 1).execute()
+
+    @classmethod
+    def rebuild(cls):
+        """Recalculates the totals by scanning blocks and transactions tables
+        """
+        block_stats = Block.statistics()
+        transaction_stats = Transaction.statistics()
+        last_height = Block.select(fn.MAX(Block.height)).scalar()
+
+        cls.delete().where(cls.id == 1).execute()
+        cls.insert(
+            id=1,
+            blocks_count=block_stats["blocks_count"],
+            last_height=last_height or 0,
+            block_transactions_count=block_stats["transactions_count"] or 0,
+            block_total_fee=block_stats["total_fee"] or 0,
+            block_total_amount=block_stats["total_amount"] or 0,
+            transactions_count=transaction_stats["transactions_count"],
+            transactions_total_fee=transaction_stats["total_fee"] or 0,
+            transactions_total_amount=transaction_stats["total_amount"] or 0,
+        ).execute()
+
+    def block_statistics(self):
+        """Returns totals of stored blocks in the same format as `Block.statistics`
+        """
+        return {
+            "transactions_count": self.block_transactions_count,
+            "total_fee": self.block_total_fee,
+            "total_amount": self.block_total_amount,
+            "blocks_count": self.blocks_count,
+        }
+
+    def transaction_statistics(self):
+        """Returns totals of stored transactions in the same format as
+        `Transaction.statistics`
+        """
+        return {
+            "transactions_count": self.transactions_count,
+            "total_fee": self.transactions_total_fee,
+            "total_amount": self.transactions_total_amount,
+        }
@@ -17,7 +17,8 @@ from .fields import BytesField
 class Transaction(Model):
     id = CharField(max_length=64, primary_key=True)
     version = SmallIntegerField()
-    block_id = ForeignKeyField(Block)
+    # Indexed together with sequence, see Meta.indexes
+    block_id = ForeignKeyField(Block, index=False)
     sequence = SmallIntegerField()
     timestamp = IntegerField(index=True)
     sender_public_key = CharField(max_length=66, index=True)
@@ -31,12 +32,9 @@ class Transaction(Model):
 
     class Meta:
         table_name = "transactions"
-        indexes = (
-            (
-                ("sender_public_key", "recipient_id", "vendor_field", "timestamp"),
-                False,
-            ),
-        )
+        # Partial indexes on type, used when building wallets, are created by the
+        # 004_transaction_indexes migration
+        indexes = ((("block_id", "sequence"), False),)
 
     @classmethod
     def from_crypto(cls, transaction):
@@ -54,9 +52,8 @@ class Transaction(Model):
         model.amount = transaction.amount
         model.fee = transaction.fee
         model.asset = transaction.asset
-        # TODO: probably obsolete
-        serialized = transaction.serialize()
-        model.serialized = serialized
+        # Stored as raw bytes, hex is only used when talking to peers
+        model.serialized = transaction.to_bytes()
         return model
 
     @staticmethod
@@ -0,0 +1,433 @@
+"""Export and import of chain snapshots, used to bootstrap new nodes without
+syncing the whole chain from peers.
+
+Snapshot file consists of:
+- header: magic bytes and snapshot format version
+- sections: zlib compressed tables (postgres COPY text format) and wallets
+- index: JSON with snapshot metadata and offsets and lengths of the sections
+- footer: offset and length of the index, followed by sha256 checksum of
+  everything that comes before the checksum
+"""
+import json
+import logging
+import os
+import random
+import zlib
+from hashlib import sha256
+from struct import Struct
+
+import click
+
+from chain.common.config import config
+from chain.common.exceptions import SnapshotException
+from chain.common.plugins import load_plugin
+from chain.crypto.utils import is_block_exception
+
+from .models.block import Block
+from .models.chain_statistics import ChainStatistics
+from .models.round import Round
+from .models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"ARKSNAP\x00"
+SNAPSHOT_VERSION = 1
+
+_HEADER = Struct("<8sI")
+# Offset and length of the index
+_INDEX_POINTER = Struct("<QI")
+_CHECKSUM_SIZE = 32
+_FOOTER_SIZE = _INDEX_POINTER.size + _CHECKSUM_SIZE
+_CHUNK_SIZE = 1024 * 1024
+# Tables are imported in this order, so foreign keys are satisfied
+_TABLES = (Block, Transaction, Round)
+_WALLETS_SECTION = "wallets"
+_WALLET_KEYS = "wallets:*"
+_POOL_WALLET_KEYS = "pool_wallet:*"
+_WALLETS_BATCH_SIZE = 10000
+
+
+class _SnapshotWriter(object):
+    """Writes data to the snapshot file and calculates its checksum
+    """
+
+    def __init__(self, f):
+        super().__init__()
+        self._file = f
+        self._hash = sha256()
+        self.offset = 0
+
+    def write(self, data):
+        self._file.write(data)
+        self._hash.update(data)
+        self.offset += len(data)
+
+    def digest(self):
+        return self._hash.digest()
+
+
+class _SectionWriter(object):
+    """File-like object that compresses section data. Used as COPY destination.
+    """
+
+    def __init__(self, writer):
+        super().__init__()
+        self._writer = writer
+        self._compressor = zlib.compressobj()
+        self._offset = writer.offset
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._writer.write(self._compressor.compress(data))
+
+    def close(self):
+        """Flushes compressed data
+
+        :returns (dict): offset and length of the section in the snapshot file
+        """
+        self._writer.write(self._compressor.flush())
+        return {"offset": self._offset, "length": self._writer.offset - self._offset}
+
+
+class _SectionReader(object):
+    """File-like object that reads and decompresses a section. Used as COPY source.
+    """
+
+    def __init__(self, f, offset, length):
+        super().__init__()
+        self._file = f
+        self._file.seek(offset)
+        self._remaining = length
+        self._decompressor = zlib.decompressobj()
+        self._buffer = b""
+        self._position = 0
+
+    def _fill(self, size):
+        while (
+            size < 0 or len(self._buffer) - self._position < size
+        ) and self._remaining:
+            chunk = self._file.read(min(_CHUNK_SIZE, self._remaining))
+            if not chunk:
+                raise SnapshotException("Snapshot file is truncated")
+            self._remaining -= len(chunk)
+            data = self._decompressor.decompress(chunk)
+            if not self._remaining:
+                data += self._decompressor.flush()
+            # Already read data is dropped only when buffer is refilled
+            self._buffer = self._buffer[self._position :] + data
+            self._position = 0
+
+    def read(self, size=-1):
+        self._fill(size)
+        if size < 0:
+            size = len(self._buffer) - self._position
+        data = self._buffer[self._position : self._position + size]
+        self._position += len(data)
+        return data
+
+    def __iter__(self):
+        """Iterates over lines of the section
+        """
+        incomplete_line = b""
+        while True:
+            data = self.read(_CHUNK_SIZE)
+            if not data:
+                break
+            lines = (incomplete_line + data).split(b"\n")
+            incomplete_line = lines.pop()
+            yield from lines
+        if incomplete_line:
+            yield incomplete_line
+
+
+def _columns(model):
+    return ", ".join(
+        '"{}"'.format(field.column_name) for field in model._meta.sorted_fields
+    )
+
+
+def _export_table(cursor, writer, model):
+    section = _SectionWriter(writer)
+    cursor.copy_expert(
+        "COPY {} ({}) TO STDOUT".format(model._meta.table_name, _columns(model)),
+        section,
+    )
+    data = section.close()
+    data["rows"] = cursor.rowcount
+    logger.info("Exported %s rows from %s", data["rows"], model._meta.table_name)
+    return data
+
+
+def _export_wallets(redis, writer):
+    section = _SectionWriter(writer)
+    rows = 0
+    keys = []
+    for key in redis.scan_iter(match=_WALLET_KEYS, count=_WALLETS_BATCH_SIZE):
+        keys.append(key)
+        if len(keys) == _WALLETS_BATCH_SIZE:
+            rows += _write_wallets(redis, section, keys)
+            keys = []
+    if keys:
+        rows += _write_wallets(redis, section, keys)
+    data = section.close()
+    data["rows"] = rows
+    logger.info("Exported %s wallet keys", rows)
+    return data
+
+
+def _write_wallets(redis, section, keys):
+    rows = 0
+    for key, value in zip(keys, redis.mget(keys)):
+        # Key might have been deleted after it was scanned
+        if value is not None:
+            section.write(b"".join([key, b"\t", value, b"\n"]))
+            rows += 1
+    return rows
+
+
+def export_snapshot(database, path):
+    """Exports blocks, transactions, rounds and wallets to a snapshot file
+
+    :param Database database: database plugin
+    :param str path: path of the snapshot file
+    :returns (dict): snapshot index
+    """
+    index = {
+        "version": SNAPSHOT_VERSION,
+        "nethash": config.network["nethash"],
+        "sections": {},
+    }
+    # Wallets are read from redis after the tables are exported, so the chain must
+    # not change while the snapshot is exported. Version of the last block changes
+    # every time a block is saved or reverted (see `Database._publish_last_block`)
+    last_block_version = database.redis.get(database._last_block_version_key)
+    with open(path, "wb") as f:
+        writer = _SnapshotWriter(f)
+        writer.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION))
+
+        with database.db.atomic():
+            # All tables are exported from the same database snapshot
+            database.db.execute_sql(
+                "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"
+            )
+            last_block = (
+                Block.select(Block.id, Block.height)
+                .order_by(Block.height.desc())
+                .first()
+            )
+            if not last_block:
+                raise SnapshotException("There are no blocks to export")
+            index["height"] = last_block.height
+            index["block_id"] = last_block.id
+
+            cursor = database.db.cursor()
+            for model in _TABLES:
+                index["sections"][model._meta.table_name] = _export_table(
+                    cursor, writer, model
+                )
+        index["sections"][_WALLETS_SECTION] = _export_wallets(
+            database.wallets.redis, writer
+        )
+        if database.redis.get(database._last_block_version_key) != last_block_version:
+            f.close()
+            os.remove(path)
+            raise SnapshotException(
+                "Last block changed while the snapshot was exported. Stop the node "
+                "before exporting a snapshot."
+            )
+
+        index_data = json.dumps(index).encode("utf-8")
+        index_offset = writer.offset
+        writer.write(index_data)
+        writer.write(_INDEX_POINTER.pack(index_offset, len(index_data)))
+        f.write(writer.digest())
+    return index
+
+
+def read_snapshot_index(f):
+    """Reads snapshot index and checksum from the snapshot file
+
+    :param file f: snapshot file opened in binary mode
+    :returns (tuple): tuple of index (dict) and checksum (bytes)
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    if size < _HEADER.size + _FOOTER_SIZE:
+        raise SnapshotException("Snapshot file is too small")
+
+    f.seek(0)
+    magic, version = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotException("File is not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotException("Unsupported snapshot version {}".format(version))
+
+    f.seek(size - _FOOTER_SIZE)
+    index_offset, index_length = _INDEX_POINTER.unpack(f.read(_INDEX_POINTER.size))
+    checksum = f.read(_CHECKSUM_SIZE)
+    # Footer is read before the checksum is verified, so it might be corrupted
+    if index_offset < _HEADER.size or index_offset + index_length > size - _FOOTER_SIZE:
+        raise SnapshotException("Snapshot index is out of bounds")
+    f.seek(index_offset)
+    try:
+        index = json.loads(f.read(index_length).decode("utf-8"))
+    except ValueError:
+        raise SnapshotException("Snapshot index is corrupted")
+    if not isinstance(index, dict):
+        raise SnapshotException("Snapshot index is corrupted")
+    return index, checksum
+
+
+def verify_snapshot_checksum(f, checksum):
+    """Checks that checksum of the snapshot file matches the stored checksum
+
+    :param file f: snapshot file opened in binary mode
+    :param bytes checksum: checksum stored in the snapshot file
+    :returns (bool): True if checksum matches
+    """
+    f.seek(0, os.SEEK_END)
+    remaining = f.tell() - _CHECKSUM_SIZE
+    f.seek(0)
+    file_hash = sha256()
+    while remaining:
+        chunk = f.read(min(_CHUNK_SIZE, remaining))
+        if not chunk:
+            return False
+        file_hash.update(chunk)
+        remaining -= len(chunk)
+    return file_hash.digest() == checksum
+
+
+def _delete_keys(redis, pattern):
+    keys = []
+    for key in redis.scan_iter(match=pattern, count=_WALLETS_BATCH_SIZE):
+        keys.append(key)
+        if len(keys) == _WALLETS_BATCH_SIZE:
+            redis.delete(*keys)
+            keys = []
+    if keys:
+        redis.delete(*keys)
+
+
+def _import_wallets(redis, reader):
+    pipeline = redis.pipeline(transaction=False)
+    rows = 0
+    for line in reader:
+        key, value = line.split(b"\t", 1)
+        pipeline.set(key, value)
+        rows += 1
+        if rows % _WALLETS_BATCH_SIZE == 0:
+            pipeline.execute()
+    pipeline.execute()
+    logger.info("Imported %s wallet keys", rows)
+
+
+def _verify_sampled_blocks(database, height, sample_size):
+    """Fully verifies (including transaction signatures) randomly chosen blocks
+    """
+    # Genesis block can't be verified
+    heights = random.sample(range(2, height + 1), min(sample_size, height - 1))
+    for block_height in heights:
+        block = database.get_blocks(
+            block_height, 0, serialized=False, with_transactions=True
+        )[0]
+        if is_block_exception(block):
+            continue
+        is_valid, errors = block.verify()
+        if not is_valid:
+            raise SnapshotException(
+                "Block {} ({}) in the snapshot is not valid: {}".format(
+                    block.id, block.height, errors
+                )
+            )
+    logger.info("Verified %s randomly chosen blocks", len(heights))
+
+
+def import_snapshot(database, path, sample_size=0):
+    """Imports a snapshot file into an empty database
+
+    :param Database database: database plugin
+    :param str path: path of the snapshot file
+    :param int sample_size: number of randomly chosen blocks that are fully
+        verified (including transaction signatures) before data is committed
+    :returns (dict): snapshot index
+    """
+    with open(path, "rb") as f:
+        index, checksum = read_snapshot_index(f)
+        if not verify_snapshot_checksum(f, checksum):
+            raise SnapshotException("Snapshot checksum does not match")
+        if index["nethash"] != config.network["nethash"]:
+            raise SnapshotException("Snapshot is for a different network")
+        if Block.select().exists():
+            raise SnapshotException("Snapshot can only be imported into empty database")
+
+        with database.db.atomic():
+            cursor = database.db.cursor()
+            for model in _TABLES:
+                section = index["sections"][model._meta.table_name]
+                cursor.copy_expert(
+                    "COPY {} ({}) FROM STDIN".format(
+                        model._meta.table_name, _columns(model)
+                    ),
+                    _SectionReader(f, section["offset"], section["length"]),
+                )
+                logger.info("Imported %s", model._meta.table_name)
+            # Round ids are copied, so the sequence needs to continue after them
+            database.db.execute_sql(
+                "SELECT setval(pg_get_serial_sequence('rounds', 'id'), "
+                "COALESCE(MAX(id), 0) + 1, false) FROM rounds"
+            )
+            ChainStatistics.rebuild()
+
+            if sample_size:
+                _verify_sampled_blocks(database, index["height"], sample_size)
+
+        # Wallets that are already in redis (and pool wallets based on them) don't
+        # belong to the imported chain
+        _delete_keys(database.wallets.redis, _WALLET_KEYS)
+        _delete_keys(database.wallets.redis, _POOL_WALLET_KEYS)
+        section = index["sections"][_WALLETS_SECTION]
+        _import_wallets(
+            database.wallets.redis,
+            _SectionReader(f, section["offset"], section["length"]),
+        )
+
+    # Last block and delegate schedules in redis might be from the data that was
+    # there before
+    database._publish_last_block(None)
+    database.delegate_schedules.invalidate_from_round(1)
+    return index
+
+
+@click.group()
+def snapshot():
+    pass
+
+
+@snapshot.command("export")
+@click.option("--path", required=True, help="Path of the snapshot file.")
+def export_command(path):
+    """Exports a snapshot. Node should be stopped, as export fails if the chain
+    changes while it's running.
+    """
+    database = load_plugin("chain.plugins.database")
+    index = export_snapshot(database, path)
+    click.echo("Exported snapshot at height {}".format(index["height"]))
+
+
+@snapshot.command("import")
+@click.option("--path", required=True, help="Path of the snapshot file.")
+@click.option(
+    "--verify-blocks",
+    default=0,
+    help="Number of randomly chosen blocks to fully verify while importing.",
+)
+def import_command(path, verify_blocks):
+    database = load_plugin("chain.plugins.database")
+    index = import_snapshot(database, path, sample_size=verify_blocks)
+    click.echo("Imported snapshot at height {}".format(index["height"]))
+
+
+if __name__ == "__main__":
+    snapshot()
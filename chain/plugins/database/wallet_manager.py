@@ -20,6 +20,7 @@ from chain.crypto.constants import (
 )
 from chain.crypto.models.wallet import Wallet
 from chain.crypto.utils import is_transaction_exception
+from chain.crypto.verification import verify_sender_second_signatures
 
 from .models.block import Block
 from .models.transaction import Transaction
@@ -44,6 +45,10 @@ class WalletManager(object):
             db=os.environ.get("REDIS_DB", 0),
         )
 
+        # When not None, changes are kept in this dict (key -> value, or None if key
+        # is deleted) instead of being written to redis. See `begin_batch`
+        self._batch = None
+
         self._genesis_addresses = set()
         for transaction in config.genesis_block["transactions"]:
             self._genesis_addresses.add(transaction["senderId"])
@@ -54,12 +59,70 @@ class WalletManager(object):
     def key_for_username(self, username):
         return self._username_key.format(username.lower())
 
+    def begin_batch(self):
+        """Starts keeping wallet changes in memory instead of writing each change to
+        redis. Changes are written with a single redis pipeline in `flush_batch`.
+        """
+        self._batch = {}
+
+    def flush_batch(self):
+        """Writes changes made since `begin_batch` or the previous flush to redis.
+        Wallet manager stays in batch mode.
+        """
+        if not self._batch:
+            return
+        pipeline = self.redis.pipeline()
+        for key, value in self._batch.items():
+            if value is None:
+                pipeline.delete(key)
+            else:
+                pipeline.set(key, value)
+        pipeline.execute()
+        self._batch = {}
+
+    def end_batch(self, discard=False):
+        """Stops batch mode and flushes pending changes to redis
+
+        :param bool discard: if True, pending changes are thrown away instead
+        """
+        if not discard:
+            self.flush_batch()
+        self._batch = None
+
+    def _get(self, key):
+        if self._batch is not None and key in self._batch:
+            return self._batch[key]
+        return self.redis.get(key)
+
+    def _set(self, key, value):
+        if self._batch is not None:
+            self._batch[key] = value
+        else:
+            self.redis.set(key, value)
+
+    def _delete(self, key):
+        if self._batch is not None:
+            self._batch[key] = None
+        else:
+            self.redis.delete(key)
+
+    def _exists(self, key):
+        if self._batch is not None and key in self._batch:
+            return self._batch[key] is not None
+        return self.redis.exists(key) == 1
+
     def save_wallet(self, wallet):
-        self.redis.set(self.key_for_address(wallet.address), wallet.to_json())
+        self._set(self.key_for_address(wallet.address), wallet.to_json())
+
+    def save_username(self, username, address):
+        self._set(self.key_for_username(username), address)
+
+    def delete_username(self, username):
+        self._delete(self.key_for_username(username))
 
     def _get_wallet_by_address(self, address):
         key = self.key_for_address(address)
-        data = self.redis.get(key)
+        data = self._get(key)
         if data is None:
             return None
         return Wallet(json.loads(data))
@@ -189,7 +252,7 @@ class WalletManager(object):
             wallet = self.find_by_public_key(transaction.sender_public_key)
             wallet.username = transaction.asset["delegate"]["username"]
             self.save_wallet(wallet)
-            self.redis.set(self.key_for_username(wallet.username), wallet.address)
+            self.save_username(wallet.username, wallet.address)
 
         # Calculate forged blocks
         forged_blocks = Block.select(
@@ -284,17 +347,13 @@ class WalletManager(object):
 
     def exists(self, public_key):
         address = address_from_public_key(public_key)
-        if self.redis.exists(self.key_for_address(address)) == 1:
-            return True
-        return False
+        return self._exists(self.key_for_address(address))
 
     def delegate_exists(self, username):
         if not username:
             return False
 
-        if self.redis.exists(self.key_for_username(username)) == 1:
-            return True
-        return False
+        return self._exists(self.key_for_username(username))
 
     def is_delegate(self, public_key):
         """Checks if a given publick_key is a registered delegate
@@ -402,6 +461,8 @@ class WalletManager(object):
         # TODO: Wrap the code below in try except and do a reverse action
         # Be careful to do it correctly as the Ark Core code doesn't do it correctly
         # at the moment (read the comments in the Ark Core catch block)
+        # Second signatures are verified together, see `can_be_applied_to_wallet`
+        verify_sender_second_signatures(block.transactions, self)
         applied_transactions = []
         try:
             for transaction in block.transactions:
@@ -432,6 +493,9 @@ class WalletManager(object):
             # TODO: exception
             raise Exception("Trying to build delegates outside of round change")
 
+        # Delegates are loaded from redis, so pending changes need to be written first
+        self.flush_batch()
+
         delegate_wallets = []
 
         keys = self.redis.keys(self.key_for_username("*"))
@@ -466,9 +530,7 @@ class WalletManager(object):
 
         # Removing the wallet from the delegates index
         if transaction.type == TRANSACTION_TYPE_DELEGATE_REGISTRATION:
-            self.redis.delete(
-                self.key_for_username(transaction.asset["delegate"]["username"])
-            )
+            self.delete_username(transaction.asset["delegate"]["username"])
 
         recipient = self.find_by_address(transaction.recipient_id)
         if transaction.type == TRANSACTION_TYPE_TRANSFER:
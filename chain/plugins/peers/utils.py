@@ -104,7 +104,7 @@ def _find_highest_common_block_height(peer, min_height, max_height):
 
 
 def _is_valid_block(block, height, current_round, delegate_keys):
-    verified, errors = block.verify()
+    verified, errors = block.verify(early_exit=True)
 
     if not verified:
         logger.info("Peer's block at height %s does not pass crypto validation", height)
@@ -138,8 +138,7 @@ def _verify_peer_blocks(peer, start_height, peer_height):
     current_round, _, max_delegates = calculate_round(start_height)
     last_height_in_round = current_round * max_delegates
     first_height_in_round = (current_round - 1) * max_delegates + 1
-    delegates = database.get_active_delegates(first_height_in_round)
-    delegate_keys = [d.public_key for d in delegates]
+    schedule = database.get_active_delegates(first_height_in_round)
 
     end_height = min(peer_height, last_height_in_round)
 
@@ -155,7 +154,7 @@ def _verify_peer_blocks(peer, start_height, peer_height):
 
         if height in height_block_map:
             is_valid = _is_valid_block(
-                height_block_map[height], height, current_round, delegate_keys
+                height_block_map[height], height, current_round, schedule
             )
             if not is_valid:
                 return False
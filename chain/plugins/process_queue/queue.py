@@ -24,7 +24,8 @@ class Queue(object):
         )
 
     def push_block(self, block):
-        serialized_block = block.serialize_full()
+        # Blocks are stored as raw bytes, hex is only used when talking to peers
+        serialized_block = block.to_bytes()
         self.db.rpush(self.list_name, serialized_block)
 
     def pop_block(self):
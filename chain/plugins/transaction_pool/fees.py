@@ -10,13 +10,18 @@ def _calculate_static_fee(transaction, block_height):
     return static_fee
 
 
-def _calculate_dynamic_fee(transaction, satoshi_per_byte):
+def _min_satoshi_per_byte(satoshi_per_byte):
     if satoshi_per_byte <= 0:
-        satoshi_per_byte = 1
+        return 1
+    return satoshi_per_byte
+
+
+def _calculate_dynamic_fee(transaction, satoshi_per_byte):
+    satoshi_per_byte = _min_satoshi_per_byte(satoshi_per_byte)
     addon_bytes = config.pool["dynamic_fees"]["addon_bytes_for_type"][
         str(transaction.type)
     ]
-    transaction_bytes = len(transaction.serialize()) / 2
+    transaction_bytes = transaction.get_serialized_length()
     return (addon_bytes + transaction_bytes) * satoshi_per_byte
 
 
@@ -46,3 +51,39 @@ def valid_fee_for_pool(transaction, block_height):
         if transaction.fee == static_fee:
             return True
     return False
+
+
+def evaluate_fees(transactions, block_height):
+    """Checks fees of many transactions at once. Settings and fee thresholds are
+    resolved once for the whole batch.
+
+    :param list transactions: list of crypto transactions
+    :param int block_height: height of the last block
+    :returns (list): list of (valid for pool, valid for broadcast) tuples, one for
+        each transaction
+    """
+    dynamic_fees = config.pool["dynamic_fees"]
+    results = []
+    if not dynamic_fees["enabled"]:
+        for transaction in transactions:
+            is_valid = transaction.fee == _calculate_static_fee(
+                transaction, block_height
+            )
+            results.append((is_valid, is_valid))
+        return results
+
+    min_fee_pool = _min_satoshi_per_byte(dynamic_fees["min_fee_pool"])
+    min_fee_broadcast = _min_satoshi_per_byte(dynamic_fees["min_fee_broadcast"])
+    addon_bytes_for_type = dynamic_fees["addon_bytes_for_type"]
+    for transaction in transactions:
+        transaction_bytes = (
+            addon_bytes_for_type[str(transaction.type)]
+            + transaction.get_serialized_length()
+        )
+        results.append(
+            (
+                transaction.fee >= transaction_bytes * min_fee_pool,
+                transaction.fee >= transaction_bytes * min_fee_broadcast,
+            )
+        )
+    return results
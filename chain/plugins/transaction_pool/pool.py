@@ -6,11 +6,12 @@ from redis import Redis
 
 from chain.common.config import config
 from chain.common.plugins import load_plugin
-from chain.crypto import time
+from chain.crypto import signature_cache, time
 from chain.crypto.objects.transactions import from_dict, from_object
+from chain.crypto.verification import verify_sender_second_signatures
 from chain.plugins.database.models.pool_transaction import PoolTransaction
 
-from .fees import valid_fee_for_broadcast, valid_fee_for_pool
+from .fees import evaluate_fees
 from .pool_wallet_manager import PoolWalletManager
 
 logger = logging.getLogger(__name__)
@@ -42,7 +43,7 @@ class Pool(object):
 
         ids = []
         for trans in expired_transactions:
-            transaction = from_object(trans)
+            transaction = from_object(trans, trusted=True)
             sender_wallet = self.find_by_public_key(transaction.sender_public_key)
             transaction.revert_for_sender_wallet(sender_wallet)
             ids.append(transaction.id)
@@ -55,7 +56,7 @@ class Pool(object):
         self._purge_expired()
         last_block = self.database.get_last_block()
         for trans in PoolTransaction.select():
-            transaction = from_object(trans)
+            transaction = from_object(trans, trusted=True)
             sender_wallet = self.wallets.find_by_public_key(
                 transaction.sender_public_key
             )
@@ -144,13 +145,11 @@ class Pool(object):
         )
         return query.exists()
 
-    def _validate_transaction(self, transaction, block_height, transactions):
+    def _validate_transaction(self, transaction):
+        """Validates transaction on its own, independently of what is in the pool"""
         if self.database.transaction_is_forged(transaction.id):
             return "Transaction {} already forged".format(transaction.id)
 
-        if self.transaction_exists(transaction.id):
-            return "Transaction {} already exists".format(transaction.id)
-
         if self.is_sender_blocked(transaction.sender_public_key):
             return "Transaction {} rejected. Sender {} is blocked.".format(
                 transaction.id, transaction.sender_public_key
@@ -169,15 +168,20 @@ class Pool(object):
             )
             return error
 
-        pool_error = transaction.validate_for_transaction_pool(self, transactions)
-        if pool_error:
-            return pool_error
-
         if not transaction.verify():
             return "Transaction {} didn't pass verification process".format(
                 transaction.id
             )
 
+    def _validate_transaction_for_pool(self, transaction, transactions):
+        """Validates transaction against transactions that are already in the pool,
+        which includes the ones accepted earlier in the same batch
+        """
+        if self.transaction_exists(transaction.id):
+            return "Transaction {} already exists".format(transaction.id)
+
+        return transaction.validate_for_transaction_pool(self, transactions)
+
     def process_transactions(self, transactions_data):
         self._purge_expired()
 
@@ -219,13 +223,33 @@ class Pool(object):
             transaction.sequence = sequence
             transactions.append(transaction)
 
-        for transaction in transactions:
+        # Fees of the whole batch are checked in one pass
+        fees = evaluate_fees(transactions, last_block.height)
+        valid_transactions = []
+        valid_fees = []
+        for transaction, fee in zip(transactions, fees):
+            validation_error = self._validate_transaction(transaction)
+            if validation_error:
+                errors[transaction.id] = validation_error
+                continue
+            valid_transactions.append(transaction)
+            valid_fees.append(fee)
+
+        # Remember verified signatures, so they're not verified again when the
+        # transactions are included in a block
+        signature_cache.set_verified(valid_transactions)
+        # Second signatures of the valid transactions are verified together, see
+        # `can_be_applied_to_wallet`
+        verify_sender_second_signatures(valid_transactions, self.wallets)
+        for transaction, (valid_for_pool, valid_for_broadcast) in zip(
+            valid_transactions, valid_fees
+        ):
             if self.has_sender_exceeded_max_transactions(transaction.sender_public_key):
                 excess.append(transaction.id)
                 continue
 
-            validation_error = self._validate_transaction(
-                transaction, last_block.height, transactions
+            validation_error = self._validate_transaction_for_pool(
+                transaction, transactions
             )
             if validation_error:
                 errors[transaction.id] = validation_error
@@ -239,11 +263,6 @@ class Pool(object):
                 )
                 continue
 
-            valid_for_pool = valid_fee_for_pool(transaction, last_block.height)
-            valid_for_broadcast = valid_fee_for_broadcast(
-                transaction, last_block.height
-            )
-
             if not valid_for_broadcast and not valid_for_pool:
                 errors[
                     transaction.id
@@ -0,0 +1,56 @@
+import pytest
+
+from chain.common.config import ExceptionIndex, config
+
+
+@pytest.mark.parametrize(
+    "height,expected",
+    [
+        (1, 1),
+        (2, 1),
+        (75599, 1),
+        (75600, 75600),
+        (99999, 75600),
+        (100000, 100000),
+        (4000000, 4000000),
+        (10000000, 4000000),
+        (75601, 75600),
+        (1, 1),
+    ],
+)
+def test_get_milestone_returns_active_milestone(height, expected):
+    assert config.get_milestone(height)["height"] == expected
+
+
+def test_get_milestone_returns_none_before_first_milestone():
+    assert config.get_milestone(0) is None
+
+
+def test_get_milestone_uses_last_found_range(mocker):
+    milestone = config.get_milestone(80000)
+    bisect_mock = mocker.patch("chain.common.config.bisect_right")
+    assert config.get_milestone(80001) is milestone
+    assert bisect_mock.call_count == 0
+
+
+def test_exception_index_compiles_exceptions():
+    index = ExceptionIndex(
+        {
+            "blocks": ["123", "456"],
+            "transaction": ["abc"],
+            "transactionIdFixTable": {"def": "ghi"},
+        }
+    )
+    assert index.is_block_exception("123") is True
+    assert index.is_block_exception("789") is False
+    assert index.is_transaction_exception("abc") is True
+    assert index.is_transaction_exception("def") is False
+    assert index.fix_transaction_id("def") == "ghi"
+    assert index.fix_transaction_id("abc") == "abc"
+
+
+def test_exception_index_handles_missing_exceptions():
+    index = ExceptionIndex({})
+    assert index.is_block_exception("123") is False
+    assert index.is_transaction_exception("abc") is False
+    assert index.fix_transaction_id("abc") == "abc"
@@ -1,8 +1,11 @@
+from binascii import unhexlify
 from copy import deepcopy
 
 import pytest
 
-from chain.crypto.objects.block import Block
+from chain.crypto.objects import block as block_module
+from chain.crypto.objects.block import Block, LazyTransactions
+from chain.crypto.objects.transactions.base import BaseTransaction
 
 
 # TODO: MOARD TESTS!!!
@@ -46,11 +49,21 @@ def test_serialize_full_correctly_serializes_block_and_its_transactions(
     assert serialized == dummy_block_full_hash
 
 
+def test_serialize_full_returns_raw_bytes(crypto_block, dummy_block_full_hash):
+    serialized = crypto_block.serialize_full(raw=True)
+    assert serialized == unhexlify(dummy_block_full_hash)
+
+
 def test_serialize_correctly_serializes_just_the_block(crypto_block, dummy_block_hash):
     serialized = crypto_block.serialize()
     assert serialized == dummy_block_hash
 
 
+def test_serialize_returns_raw_bytes(crypto_block, dummy_block_hash):
+    serialized = crypto_block.serialize(raw=True)
+    assert serialized == unhexlify(dummy_block_hash)
+
+
 def test_from_serialized_correctly_sets_deserialized_types(
     dummy_block_hash, dummy_block
 ):
@@ -113,6 +126,93 @@ def test_from_serialized_correctly_deserializes_full_data(
         assert transaction.asset == expected["asset"]
 
 
+def test_from_bytes_and_to_bytes_round_trip(dummy_block_full_hash):
+    data = unhexlify(dummy_block_full_hash)
+    block = Block.from_bytes(data)
+    assert block.id == "10977713934532967004"
+    assert len(block.transactions) == 2
+    assert block.to_bytes() == data
+
+
+def test_from_bytes_deserializes_transactions_lazily(dummy_block_full_hash, mocker):
+    from_buffer = mocker.spy(block_module, "from_buffer")
+    block = Block.from_bytes(unhexlify(dummy_block_full_hash))
+    assert isinstance(block.transactions, LazyTransactions)
+    assert len(block.transactions) == 2
+    assert from_buffer.call_count == 0
+
+    transaction = block.transactions[1]
+    assert from_buffer.call_count == 1
+    assert transaction.block_id == block.id
+    assert transaction.sequence == 1
+    assert block.transactions[-1] is transaction
+    assert from_buffer.call_count == 1
+
+    assert [t.sequence for t in block.transactions] == [0, 1]
+    assert from_buffer.call_count == 2
+    with pytest.raises(IndexError):
+        block.transactions[2]
+
+
+def test_from_dict_serializes_each_transaction_once(dummy_block, mocker):
+    get_bytes = mocker.spy(BaseTransaction, "_get_bytes")
+    block = Block.from_dict(dummy_block)
+    call_count = get_bytes.call_count
+    assert call_count == len(block.transactions)
+
+    for transaction in block.transactions:
+        assert transaction.get_id() == transaction.id
+        transaction.get_hash()
+    assert get_bytes.call_count == call_count
+
+
+def test_verify_returns_errors_from_all_stages(dummy_block):
+    block = Block.from_dict(dummy_block)
+    is_verified, errors = block.verify()
+    assert is_verified is False
+    assert errors == [
+        "Invalid total amount",
+        "Invalid total fee",
+        "Invalid payload hash",
+        "Failed to verify block signature",
+    ]
+
+
+def test_verify_early_exit_skips_signature_verification(dummy_block, mocker):
+    verify_signature = mocker.spy(Block, "verify_signature")
+    verify_transactions = mocker.patch("chain.crypto.objects.block.verify_transactions")
+    block = Block.from_dict(dummy_block)
+    block_module.reset_verification_stage_timings()
+
+    is_verified, errors = block.verify(early_exit=True)
+
+    assert is_verified is False
+    assert errors == [
+        "Invalid total amount",
+        "Invalid total fee",
+        "Invalid payload hash",
+    ]
+    assert verify_signature.call_count == 0
+    assert verify_transactions.call_count == 0
+    timings = block_module.get_verification_stage_timings()
+    assert list(timings.keys()) == [
+        "verify_header",
+        "verify_number_of_transactions",
+        "verify_payload",
+    ]
+    assert timings["verify_payload"]["count"] == 1
+
+
+def test_verify_reports_duplicate_transactions(dummy_block):
+    dummy_block["transactions"].append(dummy_block["transactions"][0])
+    block = Block.from_dict(dummy_block)
+    _, errors = block.verify()
+    assert (
+        "Encountered duplicate transaction: {}".format(block.transactions[0].id)
+        in errors
+    )
+
+
 def test_from_dict_correctly_sets_data(dummy_block):
     block = Block.from_dict(dummy_block)
 
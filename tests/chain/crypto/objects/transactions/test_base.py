@@ -1,5 +1,8 @@
+from binascii import unhexlify
+
 import pytest
 
+from chain.common.config import ExceptionIndex, config
 from chain.crypto.bytebuffer import ByteBuffer
 from chain.crypto.constants import (
     TRANSACTION_TYPE_DELEGATE_REGISTRATION,
@@ -154,6 +157,24 @@ def test_from_object(crypto_transaction):
         == "f861b25c9a87fc8913282da8855ee63b9cbaa9324543377a5bdfc5afccb92aaa"
     )
 
+def test_from_object_trusted_sets_values_without_validation(crypto_transaction):
+    # Trusted values are not converted to internal types
+    object.__setattr__(crypto_transaction, "sequence", "5")
+    transaction = BaseTransaction.from_object(crypto_transaction, trusted=True)
+    assert transaction.sequence == "5"
+    assert transaction.fee == 342000
+    assert (
+        transaction.id
+        == "f861b25c9a87fc8913282da8855ee63b9cbaa9324543377a5bdfc5afccb92aaa"
+    )
+
+
+def test_transaction_fields_are_stored_in_slots(crypto_transaction):
+    assert not hasattr(crypto_transaction, "__dict__")
+    with pytest.raises(AttributeError):
+        crypto_transaction.harambe = "gorilla"
+
+
 def test_serialize_correctly_serializes_transaction(
     dummy_transaction_hash, crypto_transaction
 ):
@@ -474,6 +495,11 @@ def test_serialize(crypto_transaction, dummy_transaction_hash):
     assert serialized == dummy_transaction_hash
 
 
+def test_serialize_returns_raw_bytes(crypto_transaction, dummy_transaction_hash):
+    serialized = crypto_transaction.serialize(raw=True)
+    assert serialized == unhexlify(dummy_transaction_hash)
+
+
 def test_deserialize_type():
     transaction = BaseTransaction()
     transaction.type = TRANSACTION_TYPE_TRANSFER
@@ -1079,6 +1105,36 @@ def test_get_bytes_vendor_field(crypto_transaction):
     )
 
 
+def test_get_bytes_is_cached(crypto_transaction, mocker):
+    get_bytes = mocker.spy(BaseTransaction, "_get_bytes")
+    bytes_data = crypto_transaction.get_bytes()
+    assert crypto_transaction.get_bytes() is bytes_data
+    assert crypto_transaction.get_hash() == crypto_transaction.get_hash()
+    assert get_bytes.call_count == 1
+
+
+def test_get_bytes_cache_is_invalidated_when_field_changes(crypto_transaction):
+    bytes_data = crypto_transaction.get_bytes()
+    transaction_hash = crypto_transaction.get_hash()
+    crypto_transaction.fee = crypto_transaction.fee + 1
+    assert crypto_transaction.get_bytes() != bytes_data
+    assert crypto_transaction.get_hash() != transaction_hash
+
+
+def test_get_bytes_cache_is_kept_when_field_is_set_to_same_value(crypto_transaction):
+    bytes_data = crypto_transaction.get_bytes()
+    crypto_transaction.fee = crypto_transaction.fee
+    assert crypto_transaction.get_bytes() is bytes_data
+
+
+def test_get_bytes_cache_is_kept_when_block_id_changes(crypto_transaction):
+    bytes_data = crypto_transaction.get_bytes()
+    crypto_transaction.block_id = "1234"
+    crypto_transaction.sequence = 5
+    crypto_transaction.id = "1234"
+    assert crypto_transaction.get_bytes() is bytes_data
+
+
 def test_get_bytes_no_vendor_field(crypto_transaction):
     crypto_transaction.vendor_field = None
     bytes_data = crypto_transaction.get_bytes(True, True)
@@ -1099,6 +1155,16 @@ def test_verify(crypto_transaction):
     assert crypto_transaction.verify() is True
 
 
+def test_verify_does_not_use_signature_cache(crypto_transaction, mocker):
+    get_verified = mocker.patch("chain.crypto.signature_cache.get_verified")
+    set_verified = mocker.patch("chain.crypto.signature_cache.set_verified")
+
+    assert crypto_transaction.verify() is True
+
+    get_verified.assert_not_called()
+    set_verified.assert_not_called()
+
+
 def test_verify_wrong_version(crypto_transaction):
     crypto_transaction.version = 123
     assert crypto_transaction.verify() is False
@@ -1126,16 +1192,13 @@ def test_get_id(crypto_transaction):
 
 
 def test_get_id_for_transaction_exception(crypto_transaction, mocker):
-    mocker.patch.dict(
-        "chain.crypto.objects.transactions.base.config.exceptions",
-        {
-            "transactionIdFixTable": {
-                "f861b25c9a87fc8913282da8855ee63b9cbaa9324543377a5bdfc5afccb92aaa": (
-                    "harambe"
-                )
-            }
-        },
-        clear=True,
+    id_fix_table = {
+        "f861b25c9a87fc8913282da8855ee63b9cbaa9324543377a5bdfc5afccb92aaa": "harambe"
+    }
+    mocker.patch.object(
+        config,
+        "exception_index",
+        ExceptionIndex({"transactionIdFixTable": id_fix_table}),
     )
 
     transaction_id = crypto_transaction.get_id()
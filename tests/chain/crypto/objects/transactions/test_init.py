@@ -1,10 +1,16 @@
+from binascii import unhexlify
+
 import pytest
 
+from chain.common.config import config
 from chain.crypto.objects.transactions import (
     TransferTransaction,
+    from_bytes,
+    from_bytes_many,
     from_dict,
     from_object,
     from_serialized,
+    from_serialized_many,
 )
 
 
@@ -17,6 +23,57 @@ def test_from_serialized(dummy_transaction_hash):
     )
 
 
+def test_from_bytes_and_to_bytes_round_trip(dummy_transaction_hash):
+    data = unhexlify(dummy_transaction_hash)
+    transaction = from_bytes(data)
+    assert isinstance(transaction, TransferTransaction)
+    assert (
+        transaction.id
+        == "f861b25c9a87fc8913282da8855ee63b9cbaa9324543377a5bdfc5afccb92aaa"
+    )
+    assert transaction.to_bytes() == data
+
+
+def test_from_bytes_many_in_current_process(
+    crypto_transaction, crypto_transaction_2, mocker
+):
+    executor_mock = mocker.patch("chain.crypto.objects.transactions.get_executor")
+    payloads = [crypto_transaction_2.to_bytes(), crypto_transaction.to_bytes()]
+
+    transactions = from_bytes_many(payloads)
+
+    assert [t.id for t in transactions] == [
+        crypto_transaction_2.id,
+        crypto_transaction.id,
+    ]
+    executor_mock.assert_not_called()
+
+
+def test_from_bytes_many_in_process_pool(
+    crypto_transaction, crypto_transaction_2, mocker
+):
+    mocker.patch.dict(
+        config.crypto["parallel_deserialization"],
+        {"min_transactions": 2, "chunk_size": 2},
+    )
+    mocker.patch.dict(config.crypto["process_pool"], {"max_workers": 2})
+    transactions = [crypto_transaction, crypto_transaction_2, crypto_transaction]
+
+    result = from_bytes_many([t.to_bytes() for t in transactions])
+
+    assert [t.id for t in result] == [t.id for t in transactions]
+    assert isinstance(result[0], TransferTransaction)
+
+
+def test_from_serialized_many(dummy_transaction_hash):
+    transactions = from_serialized_many([dummy_transaction_hash])
+    assert len(transactions) == 1
+    assert (
+        transactions[0].id
+        == "f861b25c9a87fc8913282da8855ee63b9cbaa9324543377a5bdfc5afccb92aaa"
+    )
+
+
 def test_from_serialized_raises_type_error_if_hex_not_bytes():
     with pytest.raises(TypeError) as excinfo:
         from_serialized("not_bytes")
@@ -10,7 +10,7 @@ def test_apply(redis, mocker):
     transaction.recipient_id = "DB4gFuDztmdGALMb8i1U4Z4R5SktxpNTAY"
     manager = WalletManager()
     recipient = Wallet({"address": "AThM5PNSKdU9pu1ydqQnzRWVeNCGr8HKof"})
-    apply_mock = mocker.patch.object(transaction, "apply_to_recipient_wallet")
+    apply_mock = mocker.patch.object(TransferTransaction, "apply_to_recipient_wallet")
 
     transaction.apply(None, recipient, manager)
 
@@ -0,0 +1,39 @@
+import pytest
+
+from chain.crypto.address import (
+    _address_from_public_key,
+    address_from_public_key,
+    addresses_from_public_keys,
+)
+
+PUBLIC_KEY = "034affdee0ef07d4f07fda19fc2be5b80adccc842445a187b2f80f2bb45c72c498"
+PUBLIC_KEY_2 = "03e88b0c85ea85697c3db8fd6ea08bba896339ededff04439f48c54d36e2ff9853"
+
+
+def test_address_from_public_key():
+    address = address_from_public_key(PUBLIC_KEY)
+    assert address == address_from_public_key(PUBLIC_KEY, 23)
+    assert address != address_from_public_key(PUBLIC_KEY, 30)
+
+
+def test_address_from_public_key_is_memoized():
+    _address_from_public_key.cache_clear()
+    address_from_public_key(PUBLIC_KEY)
+    address_from_public_key(PUBLIC_KEY)
+    cache_info = _address_from_public_key.cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 1
+
+
+def test_address_from_public_key_raises_for_invalid_public_key():
+    with pytest.raises(Exception) as excinfo:
+        address_from_public_key("harambe")
+    assert str(excinfo.value) == "Invalid public key"
+
+
+def test_addresses_from_public_keys():
+    addresses = addresses_from_public_keys([PUBLIC_KEY_2, PUBLIC_KEY])
+    assert addresses == [
+        address_from_public_key(PUBLIC_KEY_2),
+        address_from_public_key(PUBLIC_KEY),
+    ]
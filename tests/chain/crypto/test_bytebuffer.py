@@ -0,0 +1,37 @@
+from chain.crypto.bytebuffer import ByteBuffer
+
+
+def test_pop_moves_cursor_forward():
+    buff = ByteBuffer(b"\x01\x02\x00\x00\x00\x03\x00\x00\x00\x00\x00\x00\x00harambe")
+    assert len(buff) == 20
+    assert buff.pop_uint8() == 1
+    assert buff.pop_uint32() == 2
+    assert buff.pop_uint64() == 3
+    assert len(buff) == 7
+    assert buff.pop_bytes(7) == b"harambe"
+    assert len(buff) == 0
+
+
+def test_read_does_not_move_cursor():
+    buff = ByteBuffer(b"\xff\x01\x02\x00\x00\x00")
+    buff.pop_uint8()
+    assert buff.read_uint8() == 1
+    assert buff.read_uint32(offset=1) == 2
+    assert buff.read_bytes(2) == b"\x01\x02"
+    assert len(buff) == 5
+
+
+def test_pop_view_does_not_copy_data():
+    data = bytearray(b"\x00harambe")
+    buff = ByteBuffer(data)
+    buff.skip(1)
+    view = buff.pop_view(7)
+    assert isinstance(view, memoryview)
+    assert view.obj is data
+    assert view.tobytes() == b"harambe"
+
+
+def test_pop_bytes_returns_remaining_data_if_buffer_is_too_short():
+    buff = ByteBuffer(b"\x01\x02")
+    assert buff.pop_bytes(5) == b"\x01\x02"
+    assert len(buff) == 0
@@ -0,0 +1,28 @@
+from chain.common.config import config
+from chain.crypto import signature_cache
+
+
+def test_set_verified_and_get_verified(redis, crypto_transaction, crypto_transaction_2):
+    signature_cache.set_verified([crypto_transaction])
+
+    result = signature_cache.get_verified([crypto_transaction, crypto_transaction_2])
+
+    assert result == [True, False]
+    key = signature_cache.key_for_transaction(crypto_transaction)
+    assert redis.ttl(key) <= config.crypto["verified_signature_cache"]["ttl"]
+
+
+def test_get_verified_misses_if_transaction_changes(redis, crypto_transaction):
+    signature_cache.set_verified([crypto_transaction])
+    crypto_transaction.amount = 1
+
+    assert signature_cache.get_verified([crypto_transaction]) == [False]
+
+
+def test_get_verified_returns_false_if_cache_is_disabled(
+    redis, crypto_transaction, mocker
+):
+    signature_cache.set_verified([crypto_transaction])
+    mocker.patch.dict(config.crypto["verified_signature_cache"], {"enabled": False})
+
+    assert signature_cache.get_verified([crypto_transaction]) == [False]
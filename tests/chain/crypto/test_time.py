@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+
 from chain.crypto import time
 
 
@@ -5,3 +7,20 @@ def test_get_real_time():
     dt = time.get_real_time(45021209)
     assert isinstance(dt, int)
     assert dt == 1535122409
+
+
+def test_get_time_uses_clock():
+    time.set_clock(lambda: 1535122409.75)
+    try:
+        assert time.get_time() == 45021209
+    finally:
+        time.set_clock()
+
+
+def test_get_time_from_datetime():
+    dt = datetime(2018, 8, 24, 14, 53, 29, tzinfo=timezone.utc)
+    assert time.get_time(dt) == 45021209
+
+
+def test_get_epoch_timestamp():
+    assert time.get_epoch_timestamp() == 1490101200
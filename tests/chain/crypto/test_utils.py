@@ -0,0 +1,14 @@
+from chain.crypto.utils import load_public_key, public_key_cache_info, verify_hash
+
+
+def test_verify_hash_caches_parsed_public_key(crypto_transaction):
+    load_public_key.cache_clear()
+    message, signature, public_key = crypto_transaction.get_verification_data()
+
+    assert verify_hash(message, signature, public_key) is True
+    assert verify_hash(message, signature, public_key) is True
+
+    cache_info = public_key_cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 1
+    assert cache_info.currsize == 1
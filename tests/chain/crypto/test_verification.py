@@ -0,0 +1,100 @@
+from chain.common.config import config
+from chain.crypto import verification
+from chain.crypto.models.wallet import Wallet
+from chain.crypto.verification import (
+    verify_second_signatures,
+    verify_sender_second_signatures,
+    verify_transactions,
+)
+
+
+def test_verify_transactions_in_current_process(
+    crypto_transaction, crypto_transaction_2, mocker
+):
+    executor_mock = mocker.patch("chain.crypto.verification.get_executor")
+    crypto_transaction_2.signature = None
+
+    result = verify_transactions([crypto_transaction, crypto_transaction_2])
+
+    assert result == [True, False]
+    executor_mock.assert_not_called()
+
+
+def test_verify_transactions_in_process_pool(
+    crypto_transaction, crypto_transaction_2, mocker
+):
+    mocker.patch.dict(
+        config.crypto["parallel_verification"], {"min_transactions": 2, "chunk_size": 2}
+    )
+    mocker.patch.dict(config.crypto["process_pool"], {"max_workers": 2})
+    crypto_transaction_2.signature = None
+    transactions = [crypto_transaction, crypto_transaction_2, crypto_transaction]
+
+    result = verify_transactions(transactions)
+
+    assert result == [True, False, True]
+
+
+def test_verify_second_signatures_returns_false_if_no_second_signature(
+    crypto_transaction,
+):
+    public_key = "03e88b0c85ea85697c3db8fd6ea08bba896339ededff04439f48c54d36e2ff9853"
+    result = verify_second_signatures([crypto_transaction], [public_key])
+    assert result == [False]
+
+
+def test_verify_second_signatures_results_are_remembered(crypto_transaction, mocker):
+    public_key = "03e88b0c85ea85697c3db8fd6ea08bba896339ededff04439f48c54d36e2ff9853"
+    crypto_transaction.sign_signature = crypto_transaction.signature
+    verify_chunk = mocker.spy(verification, "_verify_chunk")
+
+    assert verify_second_signatures([crypto_transaction], [public_key]) == [False]
+    assert crypto_transaction.verify_second_signature(public_key) is False
+    assert verify_chunk.call_count == 1
+
+
+def test_verify_sender_second_signatures_verifies_signed_transactions(
+    crypto_transaction, crypto_transaction_2, mocker
+):
+    public_key = "03e88b0c85ea85697c3db8fd6ea08bba896339ededff04439f48c54d36e2ff9853"
+    crypto_transaction.sign_signature = crypto_transaction.signature
+    wallets = mocker.Mock()
+    wallets.find_by_public_key.return_value = Wallet(
+        {
+            "address": "AThM5PNSKdU9pu1ydqQnzRWVeNCGr8HKof",
+            "second_public_key": public_key,
+        }
+    )
+    verify_mock = mocker.patch(
+        "chain.crypto.verification.verify_second_signatures", return_value=[True]
+    )
+
+    verify_sender_second_signatures(
+        [crypto_transaction, crypto_transaction_2, crypto_transaction], wallets
+    )
+
+    wallets.find_by_public_key.assert_called_once_with(
+        crypto_transaction.sender_public_key
+    )
+    verify_mock.assert_called_once_with(
+        [crypto_transaction, crypto_transaction], [public_key, public_key]
+    )
+
+
+def test_verify_transactions_skips_already_verified_signatures(
+    crypto_transaction, crypto_transaction_2, mocker
+):
+    mocker.patch(
+        "chain.crypto.verification.signature_cache.get_verified",
+        return_value=[True, False],
+    )
+    set_verified_mock = mocker.patch(
+        "chain.crypto.verification.signature_cache.set_verified"
+    )
+    verify_chunk = mocker.spy(verification, "_verify_chunk")
+
+    result = verify_transactions([crypto_transaction, crypto_transaction_2])
+
+    assert result == [True, True]
+    verify_chunk.assert_called_once_with([crypto_transaction_2.get_verification_data()])
+    set_verified_mock.assert_called_once_with([crypto_transaction_2])
@@ -1,3 +1,6 @@
+import asyncio
+import json
+
 import pytest
 
 from chain.p2p.websocket_handlers import Handlers
@@ -20,3 +23,52 @@ def socket(mocker):
 #     # handler = ChainSocketHandler(ws, ws_handlers)
 
 #     await socket.handle_event(123, "p2p.peer.getBlocks", {"harambe": "omg", "lastBlockHeight": 300})
+
+
+def test_encode_list_yields_one_fragment_per_item():
+    items = ({"id": str(x)} for x in range(3))
+    headers = {"height": 5}
+
+    fragments = list(ChainSocketHandler._encode_list(123, items, headers))
+
+    assert len(fragments) == 5
+    assert json.loads("".join(fragments)) == {
+        "rid": 123,
+        "data": {
+            "data": [{"id": "0"}, {"id": "1"}, {"id": "2"}],
+            "headers": {"height": 5},
+        },
+    }
+
+
+def test_encode_list_empty():
+    fragments = ChainSocketHandler._encode_list(123, iter([]), {})
+    assert json.loads("".join(fragments)) == {
+        "rid": 123,
+        "data": {"data": [], "headers": {}},
+    }
+
+
+def test_get_blocks_reads_cursor_before_returning(mocker):
+    mocker.patch("chain.p2p.websocket_handlers.load_plugin")
+    handlers = Handlers()
+    handlers.set_socket(mocker.Mock())
+    consumed = []
+
+    def iter_blocks(*args):
+        for height in [1, 2]:
+            consumed.append(height)
+            yield mocker.Mock(**{"to_json.return_value": {"height": height}})
+
+    handlers.db.iter_blocks.side_effect = iter_blocks
+    data = {
+        "last_block_height": 0,
+        "block_limit": 2,
+        "headers_only": False,
+        "serialized": True,
+    }
+
+    blocks = asyncio.run(handlers.get_blocks(data))
+
+    assert consumed == [1, 2]
+    assert list(blocks) == [{"height": 1}, {"height": 2}]
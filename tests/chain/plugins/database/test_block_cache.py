@@ -0,0 +1,56 @@
+from chain.plugins.database.block_cache import BlockHeaderCache
+
+
+class DummyBlock(object):
+    def __init__(self, height):
+        self.height = height
+        self.id = "block_{}".format(height)
+
+
+def test_get_by_id_and_height():
+    cache = BlockHeaderCache(10)
+    block = DummyBlock(5)
+    cache.put(block)
+
+    assert cache.get_by_height(5) is block
+    assert cache.get_by_id("block_5") is block
+    assert cache.get_by_height(6) is None
+    assert cache.get_by_id("block_6") is None
+    assert cache.stats() == {"size": 1, "hits": 2, "misses": 2, "hit_rate": 0.5}
+
+
+def test_put_evicts_least_recently_used_block():
+    cache = BlockHeaderCache(2)
+    cache.put(DummyBlock(1))
+    cache.put(DummyBlock(2))
+    cache.get_by_height(1)
+    cache.put(DummyBlock(3))
+
+    assert len(cache) == 2
+    assert cache.get_by_height(2) is None
+    assert cache.get_by_id("block_2") is None
+    assert cache.get_by_height(1) is not None
+
+
+def test_put_replaces_block_on_the_same_height():
+    cache = BlockHeaderCache(10)
+    cache.put(DummyBlock(1))
+    forked_block = DummyBlock(1)
+    forked_block.id = "forked"
+    cache.put(forked_block)
+
+    assert cache.get_by_id("block_1") is None
+    assert cache.get_by_id("forked") is forked_block
+
+
+def test_invalidate_from_height():
+    cache = BlockHeaderCache(10)
+    for height in range(1, 6):
+        cache.put(DummyBlock(height))
+
+    cache.invalidate_from_height(3)
+
+    assert len(cache) == 2
+    assert cache.get_by_id("block_2") is not None
+    assert cache.get_by_id("block_3") is None
+    assert cache.get_by_height(5) is None
@@ -0,0 +1,66 @@
+from chain.common.config import config
+from chain.plugins.database import bulk
+from chain.plugins.database.bulk import copy_buffer, insert_rows
+from chain.plugins.database.models.transaction import Transaction
+
+
+def test_copy_buffer_formats_values():
+    fields = [
+        Transaction.id,
+        Transaction.vendor_field,
+        Transaction.recipient_id,
+        Transaction.serialized,
+        Transaction.asset,
+    ]
+    rows = [
+        {
+            "id": "abc",
+            "vendor_field": "Spongebob\tSquare\\pants\n",
+            "recipient_id": None,
+            "serialized": b"\xff\x02",
+            "asset": {"votes": ["+abc"]},
+        }
+    ]
+
+    buffer = copy_buffer(fields, rows)
+
+    assert buffer.read() == (
+        "abc\tSpongebob\\tSquare\\\\pants\\n\t\\N\t\\\\xff02\t" '{"votes": ["+abc"]}\n'
+    )
+
+
+def test_insert_rows_uses_insert_many_for_small_batches(mocker):
+    mocker.patch.dict(
+        config.database["bulk_insert"], {"insert_batch_size": 2, "copy_threshold": 10},
+    )
+    insert_many = mocker.patch.object(Transaction, "insert_many")
+    copy_rows = mocker.patch.object(bulk, "_copy_rows")
+    rows = [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+
+    insert_rows(mocker.Mock(), Transaction, rows)
+
+    assert insert_many.call_args_list == [
+        mocker.call([{"id": "1"}, {"id": "2"}]),
+        mocker.call([{"id": "3"}]),
+    ]
+    copy_rows.assert_not_called()
+
+
+def test_insert_rows_uses_copy_for_large_batches(mocker):
+    mocker.patch.dict(config.database["bulk_insert"], {"copy_threshold": 2})
+    insert_many = mocker.patch.object(Transaction, "insert_many")
+    db = mocker.Mock()
+    rows = [{"id": "1", "fee": 1}, {"id": "2", "fee": 2}]
+
+    insert_rows(db, Transaction, rows)
+
+    insert_many.assert_not_called()
+    sql, buffer = db.cursor.return_value.copy_expert.call_args[0]
+    assert sql == 'COPY transactions ("id", "fee") FROM STDIN'
+    assert buffer.read() == "1\t1\n2\t2\n"
+
+
+def test_insert_rows_does_nothing_without_rows(mocker):
+    db = mocker.Mock()
+    insert_rows(db, Transaction, [])
+    db.cursor.assert_not_called()
@@ -0,0 +1,40 @@
+from chain.plugins.database.models.chain_statistics import ChainStatistics
+
+
+def test_block_and_transaction_statistics():
+    statistics = ChainStatistics(
+        blocks_count=3,
+        last_height=3,
+        block_transactions_count=2,
+        block_total_fee=20,
+        block_total_amount=100,
+        transactions_count=2,
+        transactions_total_fee=20,
+        transactions_total_amount=100,
+    )
+
+    assert statistics.block_statistics() == {
+        "transactions_count": 2,
+        "total_fee": 20,
+        "total_amount": 100,
+        "blocks_count": 3,
+    }
+    assert statistics.transaction_statistics() == {
+        "transactions_count": 2,
+        "total_fee": 20,
+        "total_amount": 100,
+    }
+
+
+def test_add_block_increments_totals(crypto_block, mocker):
+    update = mocker.patch.object(ChainStatistics, "update")
+
+    ChainStatistics.add_block(crypto_block)
+
+    values = update.call_args[1]
+    assert values["last_height"] == crypto_block.height
+    assert values["transactions_count"].rhs == len(crypto_block.transactions)
+    assert values["transactions_total_fee"].rhs == sum(
+        transaction.fee for transaction in crypto_block.transactions
+    )
+    update.return_value.where.return_value.execute.assert_called_once_with()
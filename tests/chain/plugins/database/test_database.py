@@ -0,0 +1,260 @@
+import json
+
+import pytest
+
+from redis.exceptions import RedisError
+
+from chain.plugins.database.database import BlockRow, Database
+from chain.plugins.database.models.block import Block
+from chain.plugins.database.models.chain_statistics import ChainStatistics
+from chain.plugins.database.models.transaction import Transaction
+
+
+@pytest.fixture
+def database(mocker):
+    database = Database()
+    mocker.patch.object(database, "db")
+    mocker.patch.object(database, "wallets")
+    mocker.patch.object(database, "save_block")
+    mocker.patch.object(database, "apply_round")
+    return database
+
+
+def test_apply_block_checkpoints_every_batch_size_blocks(database, mocker):
+    with database.batch(2):
+        for height in [2, 3, 4]:
+            database.apply_block(mocker.Mock(height=height))
+
+    db_txn = database.db.atomic.return_value.__enter__.return_value
+    assert db_txn.commit.call_count == 1
+    database.apply_round.assert_not_called()
+    database.wallets.begin_batch.assert_called_once_with()
+    database.wallets.flush_batch.assert_called_once_with()
+    database.wallets.end_batch.assert_called_once_with()
+
+
+def test_apply_block_checkpoints_around_round_change(database, mocker):
+    with database.batch(100):
+        database.apply_block(mocker.Mock(height=51))
+
+    db_txn = database.db.atomic.return_value.__enter__.return_value
+    assert db_txn.commit.call_count == 2
+    database.apply_round.assert_called_once_with(51)
+
+
+def test_batch_discards_wallet_changes_on_exception(database, mocker):
+    database.wallets.apply_block.side_effect = ValueError("spongebob")
+
+    with pytest.raises(ValueError):
+        with database.batch(100):
+            database.apply_block(mocker.Mock(height=2))
+
+    database.wallets.end_batch.assert_called_once_with(discard=True)
+    assert database._batch_transaction is None
+
+
+def test_apply_block_applies_round_outside_batch(database, mocker):
+    database.apply_block(mocker.Mock(height=2))
+    database.apply_round.assert_called_once_with(2)
+
+
+def test_get_last_block_returns_cached_block_if_version_did_not_change(
+    database, crypto_block, mocker
+):
+    database.redis = mocker.Mock()
+    database.redis.mget.return_value = [b"1", None]
+    get_from_db = mocker.patch.object(
+        database, "_get_last_block_from_db", return_value=crypto_block
+    )
+
+    assert database.get_last_block() is crypto_block
+    assert database.get_last_block() is crypto_block
+    get_from_db.assert_called_once_with()
+
+
+def test_get_last_block_loads_block_from_redis_when_version_changes(
+    database, crypto_block, mocker
+):
+    database.redis = mocker.Mock()
+    database._last_block = crypto_block
+    database._last_block_version = b"1"
+    database.redis.mget.return_value = [
+        b"2",
+        json.dumps(crypto_block.get_header()).encode("utf-8"),
+    ]
+    get_from_db = mocker.patch.object(database, "_get_last_block_from_db")
+
+    block = database.get_last_block()
+
+    assert block is not crypto_block
+    assert block.id == crypto_block.id
+    assert block.height == crypto_block.height
+    assert database._last_block_version == b"2"
+    get_from_db.assert_not_called()
+
+
+def test_get_last_block_falls_back_to_db_if_redis_fails(database, mocker):
+    database.redis = mocker.Mock()
+    database.redis.mget.side_effect = RedisError()
+    get_from_db = mocker.patch.object(database, "_get_last_block_from_db")
+
+    block = database.get_last_block()
+
+    assert block == get_from_db.return_value
+
+
+def test_publish_last_block_bumps_version(database, crypto_block, mocker):
+    database.redis = mocker.Mock()
+
+    database._publish_last_block(crypto_block)
+
+    pipeline = database.redis.pipeline.return_value
+    pipeline.incr.assert_called_once_with("last_block:version")
+    pipeline.set.assert_called_once_with(
+        "last_block", json.dumps(crypto_block.get_header())
+    )
+
+
+def test_batch_publishes_last_block_after_commit(database, mocker):
+    publish = mocker.patch.object(database, "_publish_last_block")
+    database.save_block.side_effect = lambda block: setattr(
+        database, "_unpublished_last_block", block
+    )
+    block = mocker.Mock(height=2)
+
+    with database.batch(100):
+        database.apply_block(block)
+        publish.assert_not_called()
+
+    publish.assert_called_once_with(block)
+
+
+def test_get_blocks_by_heights_only_queries_missing_heights(
+    database, crypto_block, mocker
+):
+    database.block_cache.put(crypto_block)
+    select = mocker.patch("chain.plugins.database.database.Block.select")
+    select.return_value.where.return_value = []
+
+    blocks = database.get_blocks_by_heights([crypto_block.height, 1])
+
+    assert blocks == [crypto_block]
+    assert select.call_count == 1
+
+
+def test_revert_block_invalidates_cached_headers(database, crypto_block, mocker):
+    mocker.patch.object(database, "_publish_last_block")
+    database.block_cache.put(crypto_block)
+
+    database.revert_block(crypto_block)
+
+    assert database.block_cache.get_by_id(crypto_block.id) is None
+
+
+def _block_row(block):
+    return tuple(getattr(block, field) for field in BlockRow._fields)
+
+
+def test_iter_blocks_groups_joined_rows_by_block(
+    database, crypto_block, crypto_transaction, mocker
+):
+    serialized = crypto_transaction.serialize(raw=True)
+    row = _block_row(crypto_block)
+    server_side = mocker.patch(
+        "chain.plugins.database.database.ServerSide",
+        return_value=iter([row + (serialized,), row + (serialized,)]),
+    )
+
+    blocks = list(database.iter_blocks(1, 10, serialized=True, with_transactions=True))
+
+    assert len(blocks) == 1
+    assert blocks[0].id == crypto_block.id
+    assert blocks[0].transactions == [serialized.hex(), serialized.hex()]
+    sql, _ = server_side.call_args[0][0].sql()
+    assert "LEFT OUTER JOIN" in sql
+
+
+def test_iter_blocks_yields_blocks_without_transactions(database, crypto_block, mocker):
+    first = _block_row(crypto_block)
+    crypto_block.height += 1
+    crypto_block.id = "12345"
+    second = _block_row(crypto_block)
+    mocker.patch(
+        "chain.plugins.database.database.ServerSide",
+        return_value=iter([first + (None,), second + (None,)]),
+    )
+
+    blocks = database.iter_blocks(1, 10, serialized=False, with_transactions=True)
+
+    assert [block.transactions for block in blocks] == [[], []]
+
+
+def test_verify_blockchain_uses_chain_statistics(database, crypto_block, mocker):
+    mocker.patch.object(database, "get_last_block", return_value=crypto_block)
+    mocker.patch.object(
+        ChainStatistics,
+        "get_row",
+        return_value=ChainStatistics(
+            blocks_count=crypto_block.height,
+            last_height=crypto_block.height,
+            block_transactions_count=2,
+            block_total_fee=20,
+            block_total_amount=100,
+            transactions_count=2,
+            transactions_total_fee=20,
+            transactions_total_amount=100,
+        ),
+    )
+    block_statistics = mocker.patch.object(Block, "statistics")
+
+    is_valid, errors = database.verify_blockchain()
+
+    assert is_valid is True
+    assert errors == []
+    block_statistics.assert_not_called()
+
+
+def test_verify_blockchain_deep_check_verifies_chain_statistics(
+    database, crypto_block, mocker
+):
+    mocker.patch.object(database, "get_last_block", return_value=crypto_block)
+    mocker.patch.object(
+        ChainStatistics,
+        "get_row",
+        return_value=ChainStatistics(
+            blocks_count=crypto_block.height,
+            last_height=crypto_block.height,
+            block_transactions_count=0,
+            block_total_fee=0,
+            block_total_amount=0,
+            transactions_count=1,
+            transactions_total_fee=0,
+            transactions_total_amount=0,
+        ),
+    )
+    mocker.patch.object(
+        Block,
+        "statistics",
+        return_value={
+            "transactions_count": 0,
+            "total_fee": None,
+            "total_amount": None,
+            "blocks_count": crypto_block.height,
+        },
+    )
+    mocker.patch.object(
+        Transaction,
+        "statistics",
+        return_value={
+            "transactions_count": 0,
+            "total_fee": None,
+            "total_amount": None,
+        },
+    )
+
+    is_valid, errors = database.verify_blockchain(deep=True)
+
+    assert is_valid is False
+    assert errors == [
+        "Chain statistics transactions transactions_count: 1, calculated: 0"
+    ]
@@ -0,0 +1,135 @@
+import json
+
+from redis.exceptions import RedisError
+
+from chain.plugins.database.delegate_schedule import (
+    DelegateScheduleStore,
+    RoundSchedule,
+    shuffle_delegates,
+)
+
+
+def test_shuffle_delegates_is_deterministic_per_round():
+    public_keys = ["key{}".format(x) for x in range(51)]
+
+    shuffled = shuffle_delegates(7, public_keys)
+
+    assert shuffled == shuffle_delegates(7, public_keys)
+    assert shuffled != shuffle_delegates(8, public_keys)
+    assert sorted(shuffled) == sorted(public_keys)
+    assert public_keys == ["key{}".format(x) for x in range(51)]
+
+
+def test_round_schedule_get_delegate_for_slot():
+    schedule = RoundSchedule(1, ["a", "b", "c"])
+
+    assert schedule.get_delegate_for_slot(1) == "b"
+    assert schedule.get_delegate_for_slot(5) == "c"
+    assert "c" in schedule
+    assert "d" not in schedule
+    assert RoundSchedule(1, []).get_delegate_for_slot(5) is None
+
+
+def test_get_calculates_schedule_once_and_stores_it_to_redis(mocker):
+    redis = mocker.Mock()
+    redis.get.return_value = None
+    load_round = mocker.Mock(return_value=["a", "b", "c"])
+    store = DelegateScheduleStore(redis, 10, load_round)
+
+    schedule = store.get(3)
+    assert store.get(3) is schedule
+
+    load_round.assert_called_once_with(3)
+    assert schedule.public_keys == shuffle_delegates(3, ["a", "b", "c"])
+    redis.set.assert_called_once_with(
+        "delegate_schedule:3", json.dumps(schedule.public_keys)
+    )
+
+
+def test_get_uses_schedule_from_redis(mocker):
+    redis = mocker.Mock()
+    redis.get.side_effect = lambda key: {
+        "delegate_schedule:3": json.dumps(["c", "a", "b"]).encode("utf-8")
+    }.get(key)
+    load_round = mocker.Mock()
+    store = DelegateScheduleStore(redis, 10, load_round)
+
+    schedule = store.get(3)
+
+    assert schedule.public_keys == ["c", "a", "b"]
+    load_round.assert_not_called()
+    redis.set.assert_not_called()
+
+
+def test_get_does_not_cache_empty_round(mocker):
+    redis = mocker.Mock()
+    redis.get.return_value = None
+    load_round = mocker.Mock(return_value=[])
+    store = DelegateScheduleStore(redis, 10, load_round)
+
+    assert not store.get(3)
+    assert not store.get(3)
+
+    assert load_round.call_count == 2
+    redis.set.assert_not_called()
+
+
+def test_get_drops_cached_schedules_when_version_changes(mocker):
+    versions = {"delegate_schedule:version": None}
+    redis = mocker.Mock()
+    redis.get.side_effect = versions.get
+    load_round = mocker.Mock(return_value=["a", "b", "c"])
+    store = DelegateScheduleStore(redis, 10, load_round)
+
+    store.get(3)
+    versions["delegate_schedule:version"] = b"1"
+    store.get(3)
+
+    assert load_round.call_count == 2
+
+
+def test_get_evicts_least_recently_used_schedules(mocker):
+    redis = mocker.Mock()
+    redis.get.return_value = None
+    load_round = mocker.Mock(return_value=["a", "b", "c"])
+    store = DelegateScheduleStore(redis, 2, load_round)
+
+    store.get(1)
+    store.get(2)
+    store.get(1)
+    store.get(3)
+    store.get(1)
+    store.get(2)
+
+    assert [call[0][0] for call in load_round.call_args_list] == [1, 2, 3, 2]
+
+
+def test_get_falls_back_to_database_if_redis_fails(mocker):
+    redis = mocker.Mock()
+    redis.get.side_effect = RedisError()
+    load_round = mocker.Mock(return_value=["a", "b", "c"])
+    store = DelegateScheduleStore(redis, 10, load_round)
+
+    schedule = store.get(3)
+
+    assert sorted(schedule.public_keys) == ["a", "b", "c"]
+    load_round.assert_called_once_with(3)
+
+
+def test_invalidate_from_round_removes_later_rounds(mocker):
+    redis = mocker.Mock()
+    redis.scan_iter.return_value = [
+        b"delegate_schedule:1",
+        b"delegate_schedule:2",
+        b"delegate_schedule:3",
+    ]
+    store = DelegateScheduleStore(redis, 10, mocker.Mock())
+
+    store.invalidate_from_round(2)
+
+    pipeline = redis.pipeline.return_value
+    pipeline.delete.assert_called_once_with(
+        b"delegate_schedule:2", b"delegate_schedule:3"
+    )
+    pipeline.incr.assert_called_once_with("delegate_schedule:version")
+    pipeline.execute.assert_called_once_with()
@@ -0,0 +1,144 @@
+import pytest
+
+from chain.common.exceptions import SnapshotException
+from chain.plugins.database import snapshot
+from chain.plugins.database.snapshot import export_snapshot, import_snapshot
+
+TABLE_DATA = {
+    "blocks": b"1\tspongebob\n2\tpatrick\n",
+    "transactions": b"abc\tsandy\n" * 1000,
+    "rounds": b"",
+}
+
+
+def _copy_to(sql, f):
+    table = sql.split(" ")[1]
+    f.write(TABLE_DATA[table])
+
+
+@pytest.fixture
+def database(mocker):
+    database = mocker.MagicMock()
+    database.db.cursor.return_value.copy_expert.side_effect = _copy_to
+    database.db.cursor.return_value.rowcount = 2
+    database.wallets.redis.scan_iter.return_value = [
+        b"wallets:address:spongebob",
+        b"wallets:username:squarepants",
+    ]
+    database.wallets.redis.mget.return_value = [b'{"balance": 1}', b"spongebob"]
+    select = mocker.patch.object(snapshot.Block, "select")
+    select.return_value.order_by.return_value.first.return_value = mocker.Mock(
+        id="12345", height=2
+    )
+    select.return_value.exists.return_value = False
+    mocker.patch.object(snapshot.ChainStatistics, "rebuild")
+    return database
+
+
+def test_export_and_import_snapshot(database, tmp_path, mocker):
+    path = str(tmp_path / "snapshot")
+    export_snapshot(database, path)
+
+    imported = {}
+
+    def copy_from(sql, f):
+        imported[sql.split(" ")[1]] = f.read()
+
+    database.db.cursor.return_value.copy_expert.side_effect = copy_from
+
+    index = import_snapshot(database, path)
+
+    assert index["height"] == 2
+    assert index["block_id"] == "12345"
+    assert imported == TABLE_DATA
+    pipeline = database.wallets.redis.pipeline.return_value
+    assert pipeline.set.call_args_list == [
+        mocker.call(b"wallets:address:spongebob", b'{"balance": 1}'),
+        mocker.call(b"wallets:username:squarepants", b"spongebob"),
+    ]
+    snapshot.ChainStatistics.rebuild.assert_called_once_with()
+    database._publish_last_block.assert_called_once_with(None)
+
+
+def test_import_snapshot_deletes_existing_wallets(database, tmp_path, mocker):
+    path = str(tmp_path / "snapshot")
+    export_snapshot(database, path)
+    database.db.cursor.return_value.copy_expert.side_effect = None
+    redis = database.wallets.redis
+    redis.scan_iter.reset_mock()
+    redis.scan_iter.side_effect = lambda match, count: {
+        "wallets:*": [b"wallets:address:plankton"],
+        "pool_wallet:*": [b"pool_wallet:address:plankton"],
+    }[match]
+    manager = mocker.Mock()
+    manager.attach_mock(redis.delete, "delete")
+    manager.attach_mock(redis.pipeline.return_value.set, "set")
+
+    import_snapshot(database, path)
+
+    assert manager.mock_calls[:3] == [
+        mocker.call.delete(b"wallets:address:plankton"),
+        mocker.call.delete(b"pool_wallet:address:plankton"),
+        mocker.call.set(b"wallets:address:spongebob", b'{"balance": 1}'),
+    ]
+
+
+def test_export_snapshot_raises_if_last_block_changes(database, tmp_path):
+    path = tmp_path / "snapshot"
+    database.redis.get.side_effect = [b"1", b"2"]
+
+    with pytest.raises(SnapshotException):
+        export_snapshot(database, str(path))
+
+    assert not path.exists()
+
+
+def test_import_snapshot_raises_if_checksum_does_not_match(database, tmp_path):
+    path = tmp_path / "snapshot"
+    export_snapshot(database, str(path))
+    database.db.cursor.return_value.copy_expert.reset_mock()
+    data = bytearray(path.read_bytes())
+    data[20] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(SnapshotException):
+        import_snapshot(database, str(path))
+
+    database.db.cursor.return_value.copy_expert.assert_not_called()
+    database.wallets.redis.pipeline.assert_not_called()
+
+
+@pytest.mark.parametrize("position", [-40, -45, -60])
+def test_import_snapshot_raises_if_footer_or_index_is_corrupted(
+    database, tmp_path, position
+):
+    path = tmp_path / "snapshot"
+    export_snapshot(database, str(path))
+    data = bytearray(path.read_bytes())
+    data[position] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(SnapshotException):
+        import_snapshot(database, str(path))
+
+
+def test_import_snapshot_raises_if_file_is_not_a_snapshot(database, tmp_path):
+    path = tmp_path / "snapshot"
+    path.write_bytes(b"spongebob squarepants" * 10)
+
+    with pytest.raises(SnapshotException):
+        import_snapshot(database, str(path))
+
+
+def test_section_reader_iterates_over_lines(tmp_path):
+    path = tmp_path / "section"
+    with open(str(path), "wb") as f:
+        writer = snapshot._SnapshotWriter(f)
+        section = snapshot._SectionWriter(writer)
+        section.write(b"spongebob\npatrick\nsandy")
+        data = section.close()
+
+    with open(str(path), "rb") as f:
+        lines = list(snapshot._SectionReader(f, data["offset"], data["length"]))
+
+    assert lines == [b"spongebob", b"patrick", b"sandy"]
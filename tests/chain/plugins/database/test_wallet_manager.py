@@ -1363,3 +1363,42 @@ def test_load_active_delegate_wallets_raises_for_not_enough_delegates():
         manager.load_active_delegate_wallets(103)
 
     assert str(excinfo.value) == "Expected to find 51 delegates but only found 0."
+
+
+def test_batch_keeps_changes_in_memory_until_flushed(mocker):
+    manager = WalletManager()
+    manager.redis = mocker.Mock()
+    manager.redis.get.return_value = None
+    manager.redis.exists.return_value = 0
+    wallet = Wallet({"address": "spongebob", "username": "squarepants"})
+
+    manager.begin_batch()
+    manager.save_wallet(wallet)
+    manager.save_username("squarepants", "spongebob")
+
+    assert manager.find_by_address("spongebob").username == "squarepants"
+    assert manager.delegate_exists("squarepants") is True
+    manager.redis.set.assert_not_called()
+
+    manager.delete_username("squarepants")
+    assert manager.delegate_exists("squarepants") is False
+
+    manager.end_batch()
+
+    pipeline = manager.redis.pipeline.return_value
+    pipeline.set.assert_called_once_with("wallets:address:spongebob", wallet.to_json())
+    pipeline.delete.assert_called_once_with("wallets:username:squarepants")
+    pipeline.execute.assert_called_once_with()
+    assert manager._batch is None
+
+
+def test_end_batch_discards_changes(mocker):
+    manager = WalletManager()
+    manager.redis = mocker.Mock()
+
+    manager.begin_batch()
+    manager.save_wallet(Wallet({"address": "spongebob"}))
+    manager.end_batch(discard=True)
+
+    manager.redis.pipeline.assert_not_called()
+    manager.redis.set.assert_not_called()
@@ -0,0 +1,70 @@
+from chain.common.config import config
+from chain.plugins.transaction_pool.fees import (
+    evaluate_fees,
+    valid_fee_for_broadcast,
+    valid_fee_for_pool,
+)
+
+
+def test_evaluate_fees_matches_single_transaction_checks(
+    crypto_transaction, crypto_transaction_2, mocker
+):
+    mocker.patch.dict(
+        config.pool["dynamic_fees"], {"min_fee_pool": 3000, "min_fee_broadcast": 1}
+    )
+    transactions = [crypto_transaction, crypto_transaction_2]
+
+    result = evaluate_fees(transactions, 1)
+
+    assert result == [
+        (valid_fee_for_pool(trans, 1), valid_fee_for_broadcast(trans, 1))
+        for trans in transactions
+    ]
+
+
+def test_evaluate_fees_dynamic(crypto_transaction, mocker):
+    mocker.patch.dict(
+        config.pool["dynamic_fees"], {"min_fee_pool": 0, "min_fee_broadcast": 1000}
+    )
+    transaction_bytes = 100 + crypto_transaction.get_serialized_length()
+    crypto_transaction.fee = transaction_bytes * 10
+
+    result = evaluate_fees([crypto_transaction], 1)
+
+    assert result == [(True, False)]
+
+
+def test_evaluate_fees_keeps_fractional_fee_per_byte(crypto_transaction, mocker):
+    mocker.patch.dict(
+        config.pool["dynamic_fees"], {"min_fee_pool": 0.5, "min_fee_broadcast": 0.5}
+    )
+    transaction_bytes = 100 + crypto_transaction.get_serialized_length()
+    crypto_transaction.fee = transaction_bytes // 2 + 1
+
+    result = evaluate_fees([crypto_transaction], 1)
+
+    assert result == [(True, True)]
+    assert result == [
+        (
+            valid_fee_for_pool(crypto_transaction, 1),
+            valid_fee_for_broadcast(crypto_transaction, 1),
+        )
+    ]
+
+
+def test_evaluate_fees_static(crypto_transaction, mocker):
+    mocker.patch.dict(config.pool["dynamic_fees"], {"enabled": False})
+    crypto_transaction.fee = 10000000
+
+    result = evaluate_fees([crypto_transaction], 1)
+
+    assert result == [(True, True)]
+
+
+def test_get_serialized_length_is_cached(crypto_transaction, mocker):
+    serialize = mocker.spy(type(crypto_transaction), "_serialize")
+
+    assert crypto_transaction.get_serialized_length() == len(
+        crypto_transaction.serialize(raw=True)
+    )
+    assert serialize.call_count == 1
@@ -0,0 +1,71 @@
+import pytest
+
+from chain.crypto import signature_cache
+from chain.crypto.models.wallet import Wallet
+from chain.crypto.objects.transactions.base import BaseTransaction
+from chain.plugins.transaction_pool import pool as pool_module
+from chain.plugins.transaction_pool.pool import Pool
+
+
+@pytest.fixture
+def pool(mocker):
+    mocker.patch.object(pool_module, "load_plugin")
+    mocker.patch.object(pool_module, "PoolWalletManager")
+    mocker.patch.object(pool_module, "PoolTransaction")
+    pool = Pool()
+    pool.redis = mocker.Mock()
+    pool.redis.exists.return_value = False
+    pool.database.get_last_block.return_value = mocker.Mock(height=1)
+    pool.database.transaction_is_forged.return_value = False
+    pool_transaction = pool_module.PoolTransaction
+    pool_transaction.select.return_value.order_by.return_value.first.return_value = None
+    pool_transaction.select.return_value.count.return_value = 0
+    mocker.patch.object(pool, "transaction_exists", return_value=False)
+    mocker.patch.object(
+        pool, "has_sender_exceeded_max_transactions", return_value=False
+    )
+    mocker.patch.object(pool, "_purge_expired")
+    return pool
+
+
+def test_process_transactions_serializes_transaction_once(
+    pool, crypto_transaction, mocker
+):
+    set_verified = mocker.patch.object(signature_cache, "set_verified")
+    mocker.patch.object(
+        pool_module.time, "get_time", return_value=crypto_transaction.timestamp
+    )
+    wallet = Wallet(
+        {"address": "AThM5PNSKdU9pu1ydqQnzRWVeNCGr8HKof", "balance": 10 ** 10}
+    )
+    wallet.public_key = crypto_transaction.sender_public_key
+    pool.wallets.find_by_public_key.return_value = wallet
+    pool.wallets.can_apply_to_sender.return_value = True
+    serialize = mocker.spy(BaseTransaction, "_serialize")
+    get_bytes = mocker.spy(BaseTransaction, "_get_bytes")
+
+    result = pool.process_transactions([crypto_transaction.to_json()])
+
+    assert result["accepted"] == [crypto_transaction.id]
+    assert serialize.call_count == 1
+    # Once for the id and once for signature verification
+    assert get_bytes.call_count == 2
+    (verified,), _ = set_verified.call_args
+    assert [transaction.id for transaction in verified] == [crypto_transaction.id]
+
+
+def test_process_transactions_verifies_second_signatures_of_valid_transactions(
+    pool, crypto_transaction, mocker
+):
+    verify = mocker.patch.object(pool_module, "verify_sender_second_signatures")
+    pool.database.transaction_is_forged.return_value = True
+
+    result = pool.process_transactions([crypto_transaction.to_json()])
+
+    assert result["errors"] == {
+        crypto_transaction.id: "Transaction {} already forged".format(
+            crypto_transaction.id
+        )
+    }
+    verify.assert_called_once_with([], pool.wallets)
+    pool.wallets.can_apply_to_sender.assert_not_called()